@@ -1,3 +1,5 @@
+import os
+
 # Hacky ophyd hotfix
 from ophyd.device import Device
 
@@ -12,5 +14,14 @@ Device.OphydAttrList.__contains__ = __contains__
 del Device
 del __contains__
 
+if os.environ.get('PCDSDEVICES_UNIT_REGISTRY'):
+    # Opt-in: keep the pint startup cost out of the first unit conversion
+    from .utils import preload_unit_registry, unit_registry_mode
+    if unit_registry_mode == 'background':
+        preload_unit_registry()
+    del preload_unit_registry
+    del unit_registry_mode
+del os
+
 __version__ = get_versions()['version']
 del get_versions
@@ -55,6 +55,7 @@ class InOutPositioner(StatePositioner):
     out_states = ['OUT']
     _transmission = {}
     _in_if_not_out = False
+    _trans_enum_cache = {}
 
     tab_whitelist = ['inserted', 'removed', 'insert', 'remove', 'transmission']
 
@@ -71,6 +72,19 @@ class InOutPositioner(StatePositioner):
             self.in_states = [state for state in self.states_list
                               if state not in self.out_states
                               and state != self._unknown]
+        # Shared by instances with the same states and transmissions
+        try:
+            key = (type(self), tuple(self.states_list), tuple(self.in_states),
+                   tuple(self.out_states),
+                   tuple(sorted(self._transmission.items())))
+            self._trans_enum = self._trans_enum_cache[key]
+        except KeyError:
+            self._create_trans_enum()
+            self._trans_enum_cache[key] = self._trans_enum
+        except TypeError:
+            self._create_trans_enum()
+
+    def _create_trans_enum(self):
         self._trans_enum = {}
         self._extend_trans_enum(self.in_states, 0)
         self._extend_trans_enum(self.out_states, 1)
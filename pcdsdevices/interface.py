@@ -1,16 +1,20 @@
 """
 Module for defining bell-and-whistles movement features.
 """
+import copy
 import functools
+import hashlib
+import json
 import logging
 import numbers
+import operator
+import os
 import re
-import signal
 import time
 import typing
 from contextlib import contextmanager
 from pathlib import Path
-from threading import Event
+from threading import Event, RLock
 from types import MethodType, SimpleNamespace
 from weakref import WeakSet
 
@@ -32,6 +36,12 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 engineering_mode = True
+# Bumped to invalidate the cached tab completion lists
+_tab_generation = 0
+# First and maximum sleep between preset file lock attempts, in seconds
+_lock_backoff = (0.001, 0.05)
+# Maximum number of simultaneous signal reads for the status displays
+status_info_workers = 16
 
 OphydObject_whitelist = ["name", "connected", "check_value", "log"]
 BlueskyInterface_whitelist = ["trigger", "read", "describe", "stage",
@@ -50,10 +60,12 @@ class _TabCompletionHelper:
 
     _includes: typing.Set[str]
     _regex: typing.Optional[typing.Pattern]
+    _dir_cache: typing.Dict[str, typing.Tuple[int, typing.List[str]]]
 
     def __init__(self):
         self._includes = set()
         self._regex = None
+        self._dir_cache = {}
         self.reset()
 
     def build_regex(self) -> typing.Pattern:
@@ -61,20 +73,25 @@ class _TabCompletionHelper:
         self._regex = re.compile("|".join(sorted(self._includes)))
         return self._regex
 
+    def _invalidate(self):
+        """Forget the regular expression and the cached dir lists."""
+        self._regex = None
+        self._dir_cache.clear()
+
     def reset(self):
         """Reset the tab-completion settings."""
-        self._regex = None
+        self._invalidate()
         self._includes.clear()
 
     def add(self, attr: str):
         """Add an attribute to the include list."""
         self._includes.add(attr)
-        self._regex = None
+        self._invalidate()
 
     def remove(self, attr: str):
         """Remove an attribute from the include list."""
         self._includes.remove(attr)
-        self._regex = None
+        self._invalidate()
 
     def __repr__(self):
         return f'{self.__class__.__name__}(includes={self._includes})'
@@ -94,6 +111,7 @@ class TabCompletionHelperClass(_TabCompletionHelper):
 
     def __init__(self, cls):
         self.cls = cls
+        self._default_dir = None
         super().__init__()
 
     def reset(self):
@@ -110,6 +128,39 @@ class TabCompletionHelperClass(_TabCompletionHelper):
 
         self._includes = set(whitelist)
 
+    def get_class_dir(self) -> typing.List[str]:
+        """Get the unfiltered class dir list, cached until invalidated."""
+        try:
+            generation, dir_list = self._dir_cache['dir']
+        except KeyError:
+            pass
+        else:
+            if generation == _tab_generation:
+                return dir_list
+        dir_list = dir(self.cls)
+        self._dir_cache['dir'] = (_tab_generation, dir_list)
+        return dir_list
+
+    def get_filtered_class_dir(self) -> typing.List[str]:
+        """
+        Get the class attributes that match the class includes.
+
+        This is cached once per class and shared by all instances. Instances
+        with extra includes filter :meth:`get_class_dir` for those on top.
+        """
+        try:
+            generation, dir_list = self._dir_cache['filtered']
+        except KeyError:
+            pass
+        else:
+            if generation == _tab_generation:
+                return dir_list
+        regex = self._regex or self.build_regex()
+        dir_list = [elem for elem in self.get_class_dir()
+                    if regex.fullmatch(elem)]
+        self._dir_cache['filtered'] = (_tab_generation, dir_list)
+        return dir_list
+
     def new_instance(self, instance) -> 'TabCompletionHelperInstance':
         """
         Create a new :class:`TabCompletionHelperInstance` for the given object.
@@ -138,6 +189,7 @@ class TabCompletionHelperInstance(_TabCompletionHelper):
     class_helper: TabCompletionHelperClass
     instance: 'BaseInterface'
     super_dir: typing.Callable[[], typing.List[str]]
+    _dynamic: typing.Set[str]
 
     def __init__(self, instance, class_helper):
         assert isinstance(instance, BaseInterface), 'Must mix in BaseInterface'
@@ -145,6 +197,7 @@ class TabCompletionHelperInstance(_TabCompletionHelper):
         self.class_helper = class_helper
         self.instance = instance
         self.super_dir = super(BaseInterface, instance).__dir__
+        self._dynamic = set()
         super().__init__()
 
     def reset(self):
@@ -152,24 +205,100 @@ class TabCompletionHelperInstance(_TabCompletionHelper):
         super().reset()
         self._includes = set(self.class_helper._includes)
 
+    def add_dynamic(self, attr: str):
+        """
+        Add an attribute that is resolved by ``__getattr__``.
+
+        These attributes are not found by ``dir`` on their own, so they are
+        appended to the dir list here.
+        """
+        self._dynamic.add(attr)
+        self.add(attr)
+
+    def remove_dynamic(self, attr: str):
+        """Remove an attribute added with :meth:`add_dynamic`."""
+        self._dynamic.discard(attr)
+        self._includes.discard(attr)
+        self._invalidate()
+
+    def get_full_dir_list(self) -> typing.List[str]:
+        """Get the unfiltered dir list, including dynamic attributes."""
+        dir_list = self.super_dir()
+        if self._dynamic:
+            dir_list = list(dir_list) + sorted(self._dynamic)
+        return dir_list
+
     def get_filtered_dir_list(self) -> typing.List[str]:
-        """Get the dir list, filtered based on the whitelist."""
+        """
+        Get the dir list, filtered based on the whitelist.
+
+        The result is cached until the includes or the engineering mode
+        change.
+        """
+        try:
+            generation, dir_list = self._dir_cache['filtered']
+        except KeyError:
+            pass
+        else:
+            if generation == _tab_generation:
+                return list(dir_list)
+
         if self._regex is None:
             self.build_regex()
 
-        return [
-            elem
-            for elem in self.super_dir()
-            if self._regex.fullmatch(elem)
-        ]
+        if self.class_helper._default_dir is None:
+            self.class_helper._default_dir = _uses_default_dir(
+                self.class_helper.cls
+            )
+        if self.class_helper._default_dir:
+            class_helper = self.class_helper
+            class_includes = class_helper._includes
+            if self._includes >= class_includes:
+                dir_list = set(class_helper.get_filtered_class_dir())
+                extra = self._includes - class_includes
+                if extra:
+                    extra_regex = re.compile("|".join(sorted(extra)))
+                    dir_list.update(
+                        elem for elem in class_helper.get_class_dir()
+                        if extra_regex.fullmatch(elem)
+                    )
+            else:
+                # Some of the class includes were removed on this instance
+                dir_list = {
+                    elem for elem in class_helper.get_class_dir()
+                    if self._regex.fullmatch(elem)
+                }
+            # Only the instance attributes need to be checked here
+            instance_attrs = set(vars(self.instance)) | self._dynamic
+            dir_list.update(
+                elem for elem in instance_attrs if self._regex.fullmatch(elem)
+            )
+            dir_list = sorted(dir_list)
+        else:
+            dir_list = [
+                elem
+                for elem in self.get_full_dir_list()
+                if self._regex.fullmatch(elem)
+            ]
+        self._dir_cache['filtered'] = (_tab_generation, dir_list)
+        return list(dir_list)
 
     def get_dir(self) -> typing.List[str]:
         """Get the dir list based on the engineering mode settings."""
         if get_engineering_mode():
-            return self.super_dir()
+            return self.get_full_dir_list()
         return self.get_filtered_dir_list()
 
 
+def _uses_default_dir(cls):
+    """Whether ``super(BaseInterface, instance).__dir__`` is object's."""
+    mro = cls.mro()
+    for parent in mro[mro.index(BaseInterface) + 1:]:
+        if '__dir__' in vars(parent):
+            return parent is object
+    return True
+
+
 class BaseInterface:
     """
     Interface layer to attach to any Device for SLAC features.
@@ -192,6 +321,7 @@ class BaseInterface:
 
     _class_tab: TabCompletionHelperClass
     _tab: TabCompletionHelperInstance
+    _status_cache: typing.Optional['StatusCache'] = None
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
@@ -352,7 +482,39 @@ class BaseInterface:
         def subdevice_filter(info):
             return bool(info['kind'] & Kind.normal)
 
-        return ophydobj_info(self, subdevice_filter=subdevice_filter)
+        # Discover every signal first, then read them all at once
+        pending = []
+        info = ophydobj_info(self, subdevice_filter=subdevice_filter,
+                             pending=pending)
+        collect_signal_values(pending, cache=self._status_cache)
+        return info
+
+    def enable_status_cache(self, max_age=None):
+        """
+        Serve the status displays from monitored signal values.
+
+        The normal-kind signals are subscribed to the first time they are
+        shown, and later calls to :meth:`status_info` use the last monitor
+        update instead of reading from the IOC again. A signal that doesn't
+        change keeps its value for as long as it stays connected.
+
+        Parameters
+        ----------
+        max_age : float or None, optional
+            If given, cached values older than this many seconds are read
+            again even though they are monitored. Defaults to `None`, which
+            trusts the monitors.
+        """
+        if self._status_cache is None:
+            self._status_cache = StatusCache(max_age=max_age)
+        else:
+            self._status_cache.max_age = max_age
+
+    def disable_status_cache(self):
+        """Stop using and clear the cache from :meth:`enable_status_cache`."""
+        if self._status_cache is not None:
+            self._status_cache.clear()
+            self._status_cache = None
 
 
 def get_name(obj, default):
@@ -393,17 +555,17 @@ def get_units(signal):
             ...
 
 
-def ophydobj_info(obj, subdevice_filter=None, devices=None):
+def ophydobj_info(obj, subdevice_filter=None, devices=None, pending=None):
     if isinstance(obj, Signal):
-        return signal_info(obj)
+        return signal_info(obj, pending=pending)
     elif isinstance(obj, Device):
         return device_info(obj, subdevice_filter=subdevice_filter,
-                           devices=devices)
+                           devices=devices, pending=pending)
     else:
         return {}
 
 
-def device_info(device, subdevice_filter=None, devices=None):
+def device_info(device, subdevice_filter=None, devices=None, pending=None):
     if devices is None:
         devices = set()
     name = get_name(device, default='device')
@@ -461,30 +623,160 @@ def device_info(device, subdevice_filter=None, devices=None):
                 logger.debug(f'Getattr {name}.{cpt_name} failed.',
                              exc_info=True)
                 continue
+            if pending is not None:
+                num_pending = len(pending)
             cpt_info = ophydobj_info(cpt, subdevice_filter=subdevice_filter,
-                                     devices=devices)
+                                     devices=devices, pending=pending)
+            keep = True
             if 'position' in info:
                 # Drop some potential duplicate keys for positioners
                 try:
                     if cpt.name == cpt.parent.name:
-                        continue
+                        keep = False
                 except AttributeError:
                     pass
                 if cpt_name in ('readback', 'user_readback'):
-                    continue
+                    keep = False
 
-            if not callable(subdevice_filter) or subdevice_filter(cpt_info):
+            if keep and (not callable(subdevice_filter)
+                         or subdevice_filter(cpt_info)):
                 info[cpt_name] = cpt_info
+            elif pending is not None:
+                # Dropped, so skip the deferred reads for it
+                del pending[num_pending:]
     return info
 
 
-def signal_info(signal):
+def signal_info(signal, pending=None):
     name = get_name(signal, default='signal')
     kind = get_kind(signal)
-    value = get_value(signal)
     units = get_units(signal)
-    return dict(name=name, kind=kind, is_device=False, value=value,
+    info = dict(name=name, kind=kind, is_device=False, value=None,
                 units=units)
+    if pending is None:
+        info['value'] = get_value(signal)
+    else:
+        # Defer the read, see collect_signal_values
+        pending.append((info, signal))
+    return info
+
+
+def collect_signal_values(pending, cache=None):
+    """
+    Fill in the values of deferred ``signal_info`` dictionaries.
+
+    All of the reads are issued at once from a shared thread pool, so the
+    total time is bounded by the slowest signal rather than by the sum of
+    all of them.
+
+    Parameters
+    ----------
+    pending : list of (dict, Signal)
+        The info dictionaries and their signals, as accumulated by
+        ``ophydobj_info(..., pending=pending)``.
+
+    cache : StatusCache, optional
+        If provided, take fresh values from here and only read the rest.
+    """
+    if cache is not None:
+        misses = []
+        for info, sig in pending:
+            try:
+                info['value'] = cache.get(sig)
+            except KeyError:
+                misses.append((info, sig))
+        collect_signal_values(misses)
+        for info, sig in misses:
+            cache.add(sig, info['value'])
+        return
+
+    if len(pending) <= 1:
+        for info, sig in pending:
+            info['value'] = get_value(sig)
+        return
+
+    executor = utils.get_thread_pool('pcdsdevices_status',
+                                     status_info_workers)
+    futures = [(info, executor.submit(get_value, sig))
+               for info, sig in pending]
+    for info, future in futures:
+        info['value'] = future.result()
+
+
+class StatusCache:
+    """
+    Monitor-backed cache of signal values for the status displays.
+
+    Only normal and hinted signals are cached. Each one is subscribed to once
+    and keeps its last value along with the time it was received.
+
+    Parameters
+    ----------
+    max_age : float or None, optional
+        The age in seconds after which a cached value is considered stale.
+        If `None`, values never go stale.
+    """
+
+    def __init__(self, max_age=None):
+        self.max_age = max_age
+        self._values = {}
+        self._cids = {}
+        self._lock = RLock()
+
+    def get(self, signal):
+        """
+        Get the cached value of a signal.
+
+        Raises
+        ------
+        KeyError
+            If the signal is not cached or its value is stale.
+        """
+        with self._lock:
+            value, received = self._values[signal]
+        if self.max_age is not None:
+            if time.monotonic() - received > self.max_age:
+                raise KeyError(signal)
+        if not signal.connected:
+            return None
+        return value
+
+    def add(self, signal, value):
+        """Cache a value read from a signal, subscribing to it if needed."""
+        if not get_kind(signal) & Kind.normal:
+            return
+        with self._lock:
+            self._values[signal] = (value, time.monotonic())
+            if signal in self._cids:
+                return
+            try:
+                self._cids[signal] = signal.subscribe(
+                    self._update, event_type=signal.SUB_VALUE, run=False,
+                )
+            except Exception:
+                logger.debug('Unable to subscribe to %s for the status '
+                             'cache', get_name(signal, default='signal'),
+                             exc_info=True)
+                del self._values[signal]
+
+    def _update(self, *args, value, obj, **kwargs):
+        with self._lock:
+            self._values[obj] = (value, time.monotonic())
+
+    def clear(self):
+        """Unsubscribe from every signal and forget all cached values."""
+        with self._lock:
+            for sig, cid in self._cids.items():
+                try:
+                    sig.unsubscribe(cid)
+                except Exception:
+                    logger.debug('Error unsubscribing from %s', sig,
+                                 exc_info=True)
+            self._cids.clear()
+            self._values.clear()
+
+    def __len__(self):
+        return len(self._values)
 
 
 def set_engineering_mode(expert):
@@ -502,6 +794,9 @@ def set_engineering_mode(expert):
     """
 
     global engineering_mode
+    global _tab_generation
+    if engineering_mode != bool(expert):
+        _tab_generation += 1
     engineering_mode = bool(expert)
 
 
@@ -621,22 +916,16 @@ class MvInterface(BaseInterface):
         Shows a live-updating motor position in the terminal.
 
         This will be the value that is returned by the :attr:`position`
-        attribute.
+        attribute. The display is redrawn from readback subscriptions, so
+        every change is shown without polling the IOC.
 
         This method ends cleanly at a ctrl+c or after a call to
         :meth:`end_monitor_thread`, which may be useful when this is called in
-        a background thread.
+        a background thread. See the module-level :func:`camonitor` to
+        monitor multiple positioners at once.
         """
 
-        try:
-            self._mov_ev.clear()
-            while not self._mov_ev.is_set():
-                print("\r {0:4f}".format(self.wm()), end=" ")
-                self._mov_ev.wait(0.1)
-        except KeyboardInterrupt:
-            pass
-        finally:
-            self._mov_ev.clear()
+        camonitor(self)
 
     # Legacy alias
     def wm_update(self):
@@ -673,6 +962,19 @@ class FltMvInterface(MvInterface):
             self._presets = Presets(self)
         return self._presets
 
+    def __getattr__(self, attr):
+        # Preset methods are resolved here when Presets.lazy_methods is set
+        presets = self.__dict__.get('_presets')
+        if presets is not None:
+            method = presets._get_lazy_method(attr)
+            if method is not None:
+                return method
+        try:
+            super_getattr = super().__getattr__
+        except AttributeError:
+            raise AttributeError(attr) from None
+        return super_getattr(attr)
+
     def wm(self):
         pos = super().wm()
         try:
@@ -725,27 +1027,7 @@ class FltMvInterface(MvInterface):
             If True, inserts a newline after the updates.
         """
 
-        if log:
-            self._log_move(position)
-        try:
-            status = self.move(position, timeout=timeout, wait=False)
-        except ophyd.utils.LimitError:
-            return
-
-        pgb = AbsProgressBar([status])
-        try:
-            status.wait()
-            # Avoid race conditions involving the final update
-            pgb.manual_update()
-            pgb.no_more_updates()
-        except KeyboardInterrupt:
-            pgb.no_more_updates()
-            self.stop()
-        if pgb.has_updated and newline:
-            # If we made progress bar prints, we need an extra newline
-            print()
-        if log:
-            self._log_move_end()
+        umv_many({self: position}, timeout=timeout, log=log, newline=newline)
 
     def umvr(self, delta, timeout=None, log=True, newline=True):
         """
@@ -812,7 +1094,7 @@ class FltMvInterface(MvInterface):
         return tweak_base(self)
 
 
-def setup_preset_paths(**paths):
+def setup_preset_paths(*, backend=None, lazy_methods=False, **paths):
     """
     Prepare the :class:`Presets` class.
 
@@ -820,19 +1102,412 @@ def setup_preset_paths(**paths):
 
     Parameters
     ----------
+    backend : type, optional
+        The :class:`PresetBackend` subclass used to store the presets.
+        Defaults to :class:`YamlPresetBackend`, one yaml file per device.
+
+    lazy_methods : bool, optional
+        If `True`, the ``mv_``, ``umv_`` and ``wm_`` preset methods are
+        created on first use instead of being installed on every device at
+        each sync. See :attr:`Presets.lazy_methods`.
+
     **paths : str keyword args
         A mapping from type of preset to destination path. These will be
-        directories that contain the yaml files that define the preset
+        directories that contain the files that define the preset
         positions.
     """
 
+    if backend is None:
+        backend = YamlPresetBackend
+    Presets.lazy_methods = bool(lazy_methods)
     Presets._paths = {}
+    Presets._backends = {}
     for k, v in paths.items():
         Presets._paths[k] = Path(v)
+        Presets._backends[k] = backend(v)
+        try:
+            Presets._backends[k].load()
+        except BlockingIOError:
+            logger.error('Unable to acquire file lock to load the %s '
+                         'presets.', k)
+            logger.debug('', exc_info=True)
     for preset in Presets._registry:
         preset.sync()
 
 
+@contextmanager
+def _locked_open(path, mode='r+', timeout=1.0):
+    """
+    Open a file and hold an exclusive lock on it.
+
+    The lock is polled without blocking, with an exponential backoff, so
+    this works from any thread and does not need signal handlers.
+
+    Parameters
+    ----------
+    path : Path
+        The file to open.
+
+    mode : str, optional
+        The mode to open the file in.
+
+    timeout : float, optional
+        How long to wait for the lock.
+
+    Raises
+    ------
+    BlockingIOError
+        If we cannot acquire the file lock.
+    """
+
+    with open(path, mode) as fd:
+        deadline = time.monotonic() + timeout
+        delay = _lock_backoff[0]
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, _lock_backoff[1])
+        logger.debug('acquired lock for %s', path)
+        try:
+            yield fd
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            logger.debug('released lock for %s', path)
+
+
+def _touch(path):
+    """Create a shared preset file if it does not exist yet."""
+    if not path.exists():
+        path.touch()
+        path.chmod(0o666)
+
+
+class PresetBackend:
+    """
+    Storage for all of the presets of one preset type.
+
+    The :class:`Presets` of every device share one backend per preset type,
+    so a backend can keep an in-memory index of every device's presets.
+
+    Parameters
+    ----------
+    path : str or Path
+        The directory that holds the preset files.
+
+    Attributes
+    ----------
+    max_history : int or None
+        If set, only keep this many history entries per preset position.
+    """
+
+    max_history = None
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def file_path(self, device_name):
+        """The :class:`~pathlib.Path` that holds a device's presets."""
+        raise NotImplementedError
+
+    def load(self):
+        """Load the presets of every device at once, if supported."""
+        pass
+
+    def read(self, device_name):
+        """
+        Get a device's preset data.
+
+        Returns
+        -------
+        data : dict
+            Mapping of preset name to a dictionary with the ``value``,
+            ``active`` and ``history`` keys.
+        """
+        raise NotImplementedError
+
+    def update(self, device_name, name, value=None, comment=None,
+               active=True):
+        """
+        Update a preset position and save it.
+
+        Parameters
+        ----------
+        device_name : str
+            The name of the device the preset belongs to.
+
+        name : str
+            The name of the preset position.
+
+        value : float, optional
+            The new value. If omitted, keep the existing value.
+
+        comment : str, optional
+            A comment to record in the history.
+
+        active : bool, optional
+            Whether the preset is active.
+        """
+        raise NotImplementedError
+
+    def _apply_update(self, data, name, value, comment, active):
+        """
+        Apply an update to a device's data dictionary in place.
+
+        Returns
+        -------
+        entry : dict
+            The data that changed for this preset, in the same format as the
+            full preset data but with only the new history item.
+        """
+        if value is None and comment is not None:
+            value = data[name]['value']
+        new_history = {}
+        if value is not None:
+            if name not in data:
+                data[name] = {}
+            ts = time.strftime('%d %b %Y %H:%M:%S')
+            data[name]['value'] = value
+            history = data[name].get('history', {})
+            if comment:
+                comment = ' ' + comment
+            else:
+                comment = ''
+            new_history[ts] = '{:10.4f}{}'.format(value, comment)
+            history.update(new_history)
+            data[name]['history'] = self._trim_history(history)
+        data[name]['active'] = bool(active)
+        return dict(value=data[name]['value'], active=bool(active),
+                    history=new_history)
+
+    def _trim_history(self, history):
+        """Drop the oldest history entries beyond ``max_history``."""
+        if self.max_history is None or len(history) <= self.max_history:
+            return history
+        keys = list(history)[-self.max_history:]
+        return {key: history[key] for key in keys}
+
+
+class YamlPresetBackend(PresetBackend):
+    """
+    Preset storage with one yaml file per device.
+
+    This is the classic preset file layout. Parsed files are cached with a
+    hash of their contents, so repeated syncs of the same device do not parse
+    unchanged files again.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._cache = {}
+
+    def file_path(self, device_name):
+        path = self.path / (device_name + '.yml')
+        logger.debug('select presets path %s', path)
+        return path
+
+    @staticmethod
+    def _content_key(text):
+        # File stats can miss a same-size rewrite within one mtime tick
+        return hashlib.sha1(text.encode('utf-8')).digest()
+
+    def _read_locked(self, device_name, fd):
+        fd.seek(0)
+        text = fd.read()
+        key = self._content_key(text)
+        try:
+            cached_key, data = self._cache[device_name]
+        except KeyError:
+            pass
+        else:
+            if cached_key == key:
+                return data
+        data = yaml.full_load(text) or {}
+        self._cache[device_name] = (key, data)
+        return data
+
+    def read(self, device_name):
+        logger.debug('read presets for %s', device_name)
+        with _locked_open(self.file_path(device_name)) as fd:
+            return copy.deepcopy(self._read_locked(device_name, fd))
+
+    def update(self, device_name, name, value=None, comment=None,
+               active=True):
+        path = self.file_path(device_name)
+        _touch(path)
+        with _locked_open(path) as fd:
+            data = copy.deepcopy(self._read_locked(device_name, fd))
+            self._apply_update(data, name, value, comment, active)
+            logger.debug('write presets for %s', device_name)
+            text = yaml.dump(data, default_flow_style=False)
+            fd.seek(0)
+            fd.write(text)
+            fd.truncate()
+            fd.flush()
+            self._cache[device_name] = (self._content_key(text), data)
+
+
+class JsonlPresetBackend(PresetBackend):
+    """
+    Preset storage as one append-only JSON lines file per preset type.
+
+    Every update is appended to the file as one line, and the presets of all
+    devices are kept in one in-memory index that is loaded in a single pass
+    and then caught up incrementally with lines appended by other sessions.
+    The file is compacted down to one line per preset position during
+    :meth:`load` when it has grown to more than ``compact_ratio`` lines per
+    position.
+
+    Attributes
+    ----------
+    filename : str
+        The name of the file in the preset directory.
+
+    compact_ratio : int
+        Compaction threshold, see above.
+    """
+
+    filename = 'presets.jsonl'
+    compact_ratio = 4
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._index = {}
+        self._offset = 0
+        self._inode = None
+        self._lines = 0
+        self._lock = RLock()
+
+    def file_path(self, device_name=None):
+        return self.path / self.filename
+
+    @contextmanager
+    def _open(self):
+        """Lock the file, retrying if it was replaced by a compaction."""
+        path = self.file_path()
+        _touch(path)
+        while True:
+            with _locked_open(path, mode='rb+') as fd:
+                if os.fstat(fd.fileno()).st_ino == os.stat(path).st_ino:
+                    yield fd
+                    return
+
+    def _catch_up(self, fd):
+        """Add the lines we have not seen yet to the index."""
+        stat = os.fstat(fd.fileno())
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            # The file was compacted or replaced, start over
+            self._index = {}
+            self._offset = 0
+            self._lines = 0
+            self._inode = stat.st_ino
+        if stat.st_size == self._offset:
+            return
+        fd.seek(self._offset)
+        chunk = fd.read()
+        # Only consume complete lines
+        end = chunk.rfind(b'\n') + 1
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                self._check_record(record)
+            except ValueError as ex:
+                logger.warning('Skipping corrupt line in %s: %s',
+                               self.file_path(), ex)
+                continue
+            self._add_record(record)
+        self._offset += end
+
+    @staticmethod
+    def _check_record(record):
+        """Raise a `ValueError` unless ``record`` is a valid preset line."""
+        if not isinstance(record, dict):
+            raise ValueError('record is not an object')
+        for key, types in (('device', str), ('name', str),
+                           ('value', numbers.Real), ('active', bool),
+                           ('history', dict)):
+            if not isinstance(record.get(key), types):
+                raise ValueError(f'missing or invalid {key!r}')
+
+    def _add_record(self, record):
+        data = self._index.setdefault(record['device'], {})
+        entry = data.setdefault(record['name'], {'history': {}})
+        entry['value'] = record['value']
+        entry['active'] = record['active']
+        entry['history'].update(record['history'])
+        entry['history'] = self._trim_history(entry['history'])
+        self._lines += 1
+
+    def load(self):
+        with self._lock, self._open() as fd:
+            self._catch_up(fd)
+            count = sum(len(data) for data in self._index.values())
+            if self._lines > self.compact_ratio * max(count, 1):
+                self._compact(fd)
+
+    def read(self, device_name):
+        logger.debug('read presets for %s', device_name)
+        with self._lock:
+            path = self.file_path()
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                return {}
+            if stat.st_ino != self._inode or stat.st_size != self._offset:
+                with self._open() as fd:
+                    self._catch_up(fd)
+            return copy.deepcopy(self._index.get(device_name, {}))
+
+    def update(self, device_name, name, value=None, comment=None,
+               active=True):
+        with self._lock, self._open() as fd:
+            self._catch_up(fd)
+            data = copy.deepcopy(self._index.get(device_name, {}))
+            change = self._apply_update(data, name, value, comment, active)
+            record = dict(device=device_name, name=name, **change)
+            line = json.dumps(record).encode() + b'\n'
+            fd.seek(0, os.SEEK_END)
+            if fd.tell() > self._offset:
+                # Start fresh after a partial line from a crashed writer
+                line = b'\n' + line
+            fd.write(line)
+            fd.flush()
+            self._add_record(record)
+            self._offset = fd.tell()
+
+    def compact(self):
+        """Rewrite the file with one line per preset position."""
+        with self._lock, self._open() as fd:
+            self._catch_up(fd)
+            self._compact(fd)
+
+    def _compact(self, fd):
+        path = self.file_path()
+        logger.debug('compacting %s', path)
+        tmp = path.with_name(path.name + '.tmp')
+        lines = []
+        for device_name, data in self._index.items():
+            for name, entry in data.items():
+                record = dict(device=device_name, name=name, **entry)
+                lines.append(json.dumps(record).encode() + b'\n')
+        with open(tmp, 'wb') as tmp_fd:
+            tmp_fd.writelines(lines)
+        tmp.chmod(0o666)
+        # Waiting sessions notice the new inode and lock the new file
+        os.replace(tmp, path)
+        stat = os.stat(path)
+        self._inode = stat.st_ino
+        self._offset = stat.st_size
+        self._lines = len(lines)
+
+
 class Presets:
     """
     Manager for device preset positions.
@@ -855,101 +1530,48 @@ class Presets:
     positions : :class:`~types.SimpleNamespace`
         A namespace that contains all of the active presets as
         :class:`PresetPosition` objects.
+
+    lazy_methods : bool
+        If `True`, the device's preset methods are not installed at sync
+        time. They are instead created on first access through
+        ``FltMvInterface.__getattr__`` and listed for tab completion as
+        dynamic attributes.
+
+    generation : int
+        Incremented by every :meth:`sync`. Anything derived from the presets
+        can be cached until this changes.
     """
 
     _registry = WeakSet()
     _paths = {}
+    _backends = {}
+    lazy_methods = False
 
     def __init__(self, device):
         self._device = device
         self._methods = []
-        self._fd = None
+        self._lazy_methods = {}
+        self._lazy_cache = {}
+        self.generation = 0
         self._registry.add(self)
         self.name = device.name + '_presets'
         self.sync()
 
     def _path(self, preset_type):
         """Utility function to get the preset file :class:`~pathlib.Path`."""
-        path = self._paths[preset_type] / (self._device.name + '.yml')
-        logger.debug('select presets path %s', path)
-        return path
+        return self._backends[preset_type].file_path(self._device.name)
 
     def _read(self, preset_type):
         """Utility function to get a particular preset's datum dictionary."""
-        logger.debug('read presets for %s', self._device.name)
-        with self._file_open_rlock(preset_type) as f:
-            f.seek(0)
-            return yaml.full_load(f) or {}
-
-    def _write(self, preset_type, data):
-        """
-        Utility function to overwrite a particular preset's datum dictionary.
-        """
-        logger.debug('write presets for %s', self._device.name)
-        with self._file_open_rlock(preset_type) as f:
-            f.seek(0)
-            yaml.dump(data, f, default_flow_style=False)
-            f.truncate()
-
-    @contextmanager
-    def _file_open_rlock(self, preset_type, timeout=1.0):
-        """
-        File locking context manager for this object.
-
-        Works like threading.Rlock in that you can acquire it multiple times
-        safely.
-
-        Parameters
-        ----------
-        fd : file
-            The file descriptor to lock on.
-
-        Raises
-        ------
-        BlockingIOError
-            If we cannot acquire the file lock.
-        """
-
-        if self._fd is None:
-            path = self._path(preset_type)
-            with open(path, 'r+') as fd:
-                # Set up file lock timeout with a raising handler
-                # We will need this handler due to PEP 475
-                def interrupt(signum, frame):
-                    raise InterruptedError()
-
-                old_handler = signal.signal(signal.SIGALRM, interrupt)
-                try:
-                    signal.setitimer(signal.ITIMER_REAL, timeout)
-                    fcntl.flock(fd, fcntl.LOCK_EX)
-                except InterruptedError:
-                    # Ignore interrupted and proceed to cleanup
-                    pass
-                finally:
-                    # Clean up file lock timeout
-                    signal.setitimer(signal.ITIMER_REAL, 0)
-                    signal.signal(signal.SIGALRM, old_handler)
-                # Error now if we still can't get the lock.
-                # Getting lock twice is safe.
-                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-                logger.debug('acquired lock for %s', path)
-                self._fd = fd
-                yield fd
-                fcntl.flock(fd, fcntl.LOCK_UN)
-                logger.debug('released lock for %s', path)
-            self._fd = None
-        else:
-            logger.debug('using already open file descriptor')
-            yield self._fd
+        return self._backends[preset_type].read(self._device.name)
 
     def _update(self, preset_type, name, value=None, comment=None,
                 active=True):
         """
         Utility function to update a preset position.
 
-        Reads the existing preset's datum, updates the value the comment, and
-        the active state, and then writes the datum back to the file, updating
-        the history accordingly.
+        Updates the value, the comment, and the active state in the preset
+        type's backend, updating the history accordingly.
         """
 
         logger.debug(('call %s presets._update(%s, %s, value=%s, comment=%s, '
@@ -962,31 +1584,9 @@ class Presets:
             raise TypeError(('value must be a real numeric type, not type'
                              '{}'.format(type(value))))
         try:
-            path = self._path(preset_type)
-            if not path.exists():
-                path.touch()
-                path.chmod(0o666)
-            with self._file_open_rlock(preset_type):
-                data = self._read(preset_type)
-                if value is None and comment is not None:
-                    value = data[name]['value']
-                if value is not None:
-                    if name not in data:
-                        data[name] = {}
-                    ts = time.strftime('%d %b %Y %H:%M:%S')
-                    data[name]['value'] = value
-                    history = data[name].get('history', {})
-                    if comment:
-                        comment = ' ' + comment
-                    else:
-                        comment = ''
-                    history[ts] = '{:10.4f}{}'.format(value, comment)
-                    data[name]['history'] = history
-                if active:
-                    data[name]['active'] = True
-                else:
-                    data[name]['active'] = False
-                self._write(preset_type, data)
+            self._backends[preset_type].update(self._device.name, name,
+                                               value=value, comment=comment,
+                                               active=active)
         except BlockingIOError:
             self._log_flock_error()
 
@@ -1000,13 +1600,17 @@ class Presets:
             path = self._path(preset_type)
             if path.exists():
                 try:
-                    self._cache[preset_type] = self._read(preset_type)
+                    data = self._read(preset_type)
                 except BlockingIOError:
                     self._log_flock_error()
+                else:
+                    if data:
+                        self._cache[preset_type] = data
             else:
                 logger.debug('No %s preset file for %s',
                              preset_type, self._device.name)
         self._create_methods()
+        self.generation += 1
 
     def _log_flock_error(self):
         logger.error(('Unable to acquire file lock for %s. '
@@ -1031,11 +1635,15 @@ class Presets:
         for preset_type, data in self._cache.items():
             for name, info in data.items():
                 if info['active']:
-                    mv, umv = self._make_mv_pre(preset_type, name)
-                    wm = self._make_wm_pre(preset_type, name)
-                    self._register_method(self._device, 'mv_' + name, mv)
-                    self._register_method(self._device, 'umv_' + name, umv)
-                    self._register_method(self._device, 'wm_' + name, wm)
+                    if self.lazy_methods:
+                        self._register_lazy(preset_type, name)
+                    else:
+                        mv, umv = self._make_mv_pre(preset_type, name)
+                        wm = self._make_wm_pre(preset_type, name)
+                        self._register_method(self._device, 'mv_' + name, mv)
+                        self._register_method(self._device, 'umv_' + name,
+                                              umv)
+                        self._register_method(self._device, 'wm_' + name, wm)
                     setattr(self.positions, name,
                             PresetPosition(self, preset_type, name))
 
@@ -1053,6 +1661,48 @@ class Presets:
         if hasattr(obj, '_tab'):
             obj._tab.add(method_name)
 
+    def _register_lazy(self, preset_type, name):
+        """
+        Utility function for managing lazy methods.
+
+        Records the device's preset methods so that :meth:`_get_lazy_method`
+        can create them on first use, and lists them for tab completion.
+        """
+
+        tab = getattr(self._device, '_tab', None)
+        for prefix in ('mv_', 'umv_', 'wm_'):
+            method_name = prefix + name
+            self._lazy_methods[method_name] = (prefix, preset_type, name)
+            if tab is not None:
+                tab.add_dynamic(method_name)
+
+    def _get_lazy_method(self, method_name):
+        """
+        Get a lazily created preset method for the device.
+
+        Returns
+        -------
+        method : method or None
+            The bound method, or `None` if there is no such preset method.
+        """
+
+        try:
+            return self._lazy_cache[method_name]
+        except KeyError:
+            pass
+        try:
+            prefix, preset_type, name = self._lazy_methods[method_name]
+        except KeyError:
+            return None
+        if prefix == 'wm_':
+            method = self._make_wm_pre(preset_type, name)
+        else:
+            mv, umv = self._make_mv_pre(preset_type, name)
+            method = mv if prefix == 'mv_' else umv
+        bound = MethodType(method, self._device)
+        self._lazy_cache[method_name] = bound
+        return bound
+
     def _make_add(self, preset_type):
         """
         Create the functions that add preset positions.
@@ -1187,6 +1837,12 @@ class Presets:
             if hasattr(obj, '_tab'):
                 obj._tab.remove(method_name)
         self._methods = []
+        tab = getattr(self._device, '_tab', None)
+        if tab is not None:
+            for method_name in self._lazy_methods:
+                tab.remove_dynamic(method_name)
+        self._lazy_methods = {}
+        self._lazy_cache = {}
         self.positions = SimpleNamespace()
 
     @property
@@ -1205,11 +1861,15 @@ class Presets:
         """
         state = 'Unknown'
         closest = 0.5
-        for device, method_name in self._methods:
-            if method_name.startswith('wm_'):
-                state_name = method_name.replace('wm_', '', 1)
-                wm_state = getattr(device, method_name)
-                diff = wm_state()
+        position = None
+        for data in self._cache.values():
+            for state_name, info in data.items():
+                if not info['active']:
+                    continue
+                if position is None:
+                    position = self._device.wm()
+                # Same as the wm_ method, value minus position
+                diff = info['value'] - position
                 if diff < closest:
                     state = state_name
                     closest = diff
@@ -1301,21 +1961,232 @@ class PresetPosition:
         return str(self.pos)
 
 
-def tweak_base(*args):
+def umv_many(positions, timeout=None, log=True, newline=True):
+    """
+    Move several motors at once, wait, and update with progress bars.
+
+    Every move is started before waiting on any of them, so this takes as
+    long as the longest move. All of the positions are checked against the
+    limits first, and nothing moves if one of them is out of range. Ctrl+c
+    stops all of the motors, as does a move that fails or times out, in
+    which case the error is re-raised.
+
+    Parameters
+    ----------
+    positions : dict
+        Mapping of ``{motor: position}`` for motors that implement
+        :class:`FltMvInterface`.
+
+    timeout : float, optional
+        If provided, the movers will throw an error if motion takes longer
+        than timeout to complete. If omitted, the movers' default timeouts
+        will be used.
+
+    log : bool, optional
+        If True, logs the moves at INFO level.
+
+    newline : bool, optional
+        If True, inserts a newline after the updates.
+
+    Raises
+    ------
+    ValueError
+        If no motors are given.
+    """
+
+    if not positions:
+        raise ValueError('umv_many needs at least one motor')
+    motors = list(positions)
+    for motor in motors:
+        try:
+            motor.check_value(positions[motor])
+        except ophyd.utils.LimitError as ex:
+            motor._log_move_limit_error(positions[motor], ex)
+            return
+
+    statuses = []
+    for motor in motors:
+        position = positions[motor]
+        if log:
+            motor._log_move(position)
+        try:
+            statuses.append(motor.move(position, timeout=timeout,
+                                       wait=False))
+        except BaseException as ex:
+            # Don't leave the other motors moving on their own
+            for started in motors[:len(statuses)]:
+                started.stop()
+            if isinstance(ex, ophyd.utils.LimitError):
+                return
+            raise
+
+    status = functools.reduce(operator.and_, statuses)
+    pgb = AbsProgressBar(statuses)
+    try:
+        status.wait()
+        # Avoid race conditions involving the final update
+        pgb.manual_update()
+        pgb.no_more_updates()
+    except BaseException as ex:
+        # A failed or interrupted axis stops all of them
+        pgb.no_more_updates()
+        for motor in motors:
+            motor.stop()
+        if not isinstance(ex, KeyboardInterrupt):
+            raise
+    if pgb.has_updated and newline:
+        # If we made progress bar prints, we need an extra newline
+        print()
+    if log:
+        for motor in motors:
+            motor._log_move_end()
+
+
+def umvr_many(deltas, timeout=None, log=True, newline=True):
+    """
+    Relative move of several motors at once, wait, and update.
+
+    Parameters
+    ----------
+    deltas : dict
+        Mapping of ``{motor: delta}`` for motors that implement
+        :class:`FltMvInterface`.
+
+    timeout : float, optional
+        If provided, the movers will throw an error if motion takes longer
+        than timeout to complete. If omitted, the movers' default timeouts
+        will be used.
+
+    log : bool, optional
+        If True, logs the moves at INFO level.
+
+    newline : bool, optional
+        If True, inserts a newline after the updates.
+
+    Raises
+    ------
+    ValueError
+        If no motors are given.
+    """
+
+    if not deltas:
+        raise ValueError('umvr_many needs at least one motor')
+    positions = {motor: delta + motor.wm() for motor, delta in deltas.items()}
+    umv_many(positions, timeout=timeout, log=log, newline=newline)
+
+
+def _subscribe_readbacks(positioners, callback):
+    """
+    Subscribe a callback to the readbacks of several positioners.
+
+    Returns
+    -------
+    subscriptions : list of (positioner, int)
+        The subscription ids, to unsubscribe when done.
+
+    poll : bool
+        `True` if some of the positioners could not be subscribed to.
+    """
+    subscriptions = []
+    poll = False
+    for mot in positioners:
+        event_type = getattr(mot, 'SUB_READBACK', None)
+        if event_type not in mot.subscriptions:
+            event_type = None
+        try:
+            cid = mot.subscribe(callback, event_type=event_type, run=False)
+        except Exception:
+            logger.debug('Unable to subscribe to %s, polling instead',
+                         mot.name, exc_info=True)
+            poll = True
+        else:
+            subscriptions.append((mot, cid))
+    return subscriptions, poll
+
+
+def camonitor(*positioners, refresh=0.05):
+    """
+    Shows live-updating positions of one or more positioners in the terminal.
+
+    The positions are redrawn on one line whenever a readback update arrives.
+    Updates that arrive faster than ``refresh`` are coalesced into a single
+    redraw.
+
+    This ends cleanly at a ctrl+c or after a call to
+    :meth:`MvInterface.end_monitor_thread` on any of the positioners.
+
+    Parameters
+    ----------
+    *positioners : MvInterface
+        The positioners to monitor.
+
+    refresh : float, optional
+        The minimum time between redraws, in seconds.
+
+    Raises
+    ------
+    ValueError
+        If no positioners are given.
+    """
+    if not positioners:
+        raise ValueError('camonitor needs at least one positioner')
+
+    updated = Event()
+
+    def update(*args, **kwargs):
+        updated.set()
+
+    def show_status():
+        if len(positioners) == 1:
+            text = "\r {0:4f}".format(positioners[0].wm())
+        else:
+            positions = ['{}: {:4f}'.format(mot.name, mot.wm())
+                         for mot in positioners]
+            text = '\x1b[2K\r ' + ', '.join(positions)
+        print(text, end=" ")
+
+    def stopped():
+        return any(mot._mov_ev.is_set() for mot in positioners)
+
+    subscriptions, poll = _subscribe_readbacks(positioners, update)
+    try:
+        for mot in positioners:
+            mot._mov_ev.clear()
+        show_status()
+        while not stopped():
+            # Wake up periodically to notice end_monitor_thread
+            if updated.wait(0.1) or poll:
+                updated.clear()
+                show_status()
+                time.sleep(refresh)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for mot, cid in subscriptions:
+            mot.unsubscribe(cid)
+        for mot in positioners:
+            mot._mov_ev.clear()
+
+
+def tweak_base(*args, refresh=0.1):
     """
     Base function to control motors with the arrow keys.
 
     With one motor, you can use the right and left arrow keys to move + and -.
     With two motors, you can also use the up and down arrow keys for the second
-    motor.
-    Three motor and more are not yet supported.
+    motor. Alt+arrows control the third and fourth motors, and ctrl+arrows
+    control the fifth and sixth motors.
+
+    Keys are handled as soon as they are pressed. A key pressed while its motor
+    is still moving retargets the move, and repeated key presses are merged
+    into one move.
 
     The scale for the tweak can be doubled by pressing + and halved by pressing
     -. Shift+up and shift+down can also be used, and the up and down keys will
     also adjust the scaling in one motor mode.
 
-    Ctrl+c will stop an ongoing move during a tweak without exiting the tweak.
-    Both q and ctrl+c will quit the tweak between moves.
+    Ctrl+c will stop all ongoing moves during a tweak without exiting the
+    tweak. Both q and ctrl+c will quit the tweak when nothing is moving.
     """
 
     up = utils.arrow_up
@@ -1330,13 +2201,37 @@ def tweak_base(*args):
     abs_status = '{}: {:.4f}'
     exp_status = '{}: {:.4e}'
 
+    axis_keys = [
+        (left, right),
+        (down, up),
+        (utils.alt_arrow_left, utils.alt_arrow_right),
+        (utils.alt_arrow_down, utils.alt_arrow_up),
+        (utils.ctrl_arrow_left, utils.ctrl_arrow_right),
+        (utils.ctrl_arrow_down, utils.ctrl_arrow_up),
+    ]
+    axis_names = ['Left/Right', 'Down/Up', 'Alt+Left/Right', 'Alt+Down/Up',
+                  'Ctrl+Left/Right', 'Ctrl+Down/Up']
+    if not 1 <= len(args) <= len(axis_keys):
+        raise ValueError(f'Tweak supports 1 to {len(axis_keys)} motors, not '
+                         f'{len(args)}.')
+
+    # Map each move key to its motor index and direction
+    move_keys = {}
+    for i, (neg, pos) in enumerate(axis_keys[:len(args)]):
+        move_keys[neg] = (i, -1)
+        move_keys[pos] = (i, 1)
     if len(args) == 1:
-        move_keys = (left, right)
         scale_keys = (up, down, plus, minus, shift_up, shift_down)
-    elif len(args) == 2:
-        move_keys = (left, right, up, down)
+    else:
         scale_keys = (plus, minus, shift_up, shift_down)
 
+    targets = [None] * len(args)
+    statuses = [None] * len(args)
+    updated = Event()
+
+    def update(*cb_args, **cb_kwargs):
+        updated.set()
+
     def show_status():
         if scale >= 0.0001:
             template = abs_status
@@ -1354,10 +2249,8 @@ def tweak_base(*args):
             print(" Up or +: scale*2")
             print(" Down or -: scale/2")
         else:
-            print(" Left: move x motor left")
-            print(" Right: move x motor right")
-            print(" Down: move y motor down")
-            print(" Up: move y motor up")
+            for name, mot in zip(axis_names, args):
+                print(f" {name}: move {mot.name} backward/forward")
             print(" + or Shift_Up: scale*2")
             print(" - or Shift_Down: scale/2")
         print(" Press q to quit."
@@ -1372,37 +2265,78 @@ def tweak_base(*args):
             scale = scale/2
         return scale
 
-    def movement(scale, direction):
-        """Function used to know when and the direction to move the motor."""
+    def moving():
+        return any(st is not None and not st.done for st in statuses)
+
+    def movement(i, delta):
+        """Start or retarget the move of one motor."""
+        mot = args[i]
         try:
-            if direction == left:
-                args[0].umvr(-scale, log=False, newline=False)
-            elif direction == right:
-                args[0].umvr(scale, log=False, newline=False)
-            elif direction == up:
-                args[1].umvr(scale, log=False, newline=False)
-            elif direction == down:
-                args[1].umvr(-scale, log=False, newline=False)
+            if statuses[i] is not None and not statuses[i].done:
+                # Still moving: stack onto the previous target
+                target = targets[i] + delta
+            else:
+                target = mot.wm() + delta
+            statuses[i] = mot.move(target, wait=False)
+            targets[i] = target
         except Exception as exc:
             logger.error('Error in tweak move: %s', exc)
             logger.debug('', exc_info=True)
 
+    def stop():
+        for mot in args:
+            try:
+                mot.stop()
+            except Exception:
+                logger.debug('Error stopping %s', mot.name, exc_info=True)
+
     start_text = ['{} at {:.4f}'.format(mot.name, mot.wm()) for mot in args]
     logger.info('Started tweak of ' + ', '.join(start_text))
 
-    # Loop takes in user key input and stops when 'q' is pressed
-    is_input = True
-    while is_input is True:
-        show_status()
-        inp = utils.get_input()
-        if inp in ('q', None):
-            is_input = False
-        elif inp in move_keys:
-            movement(scale, inp)
-        elif inp in scale_keys:
-            scale = edit_scale(scale, inp)
-        else:
-            usage()
+    subscriptions, poll = _subscribe_readbacks(args, update)
+    try:
+        with utils.KeyReader() as reader:
+            show_status()
+            is_input = True
+            while is_input:
+                try:
+                    keys = reader.read(timeout=refresh)
+                    # Merge the key presses that arrived together
+                    deltas = {}
+                    for inp in keys:
+                        if inp == 'q':
+                            is_input = False
+                            break
+                        elif inp in move_keys:
+                            i, sign = move_keys[inp]
+                            deltas[i] = deltas.get(i, 0) + sign * scale
+                        elif inp in scale_keys:
+                            scale = edit_scale(scale, inp)
+                        else:
+                            usage()
+                    for i, delta in deltas.items():
+                        movement(i, delta)
+                    if keys or poll or updated.is_set():
+                        updated.clear()
+                        show_status()
+                except KeyboardInterrupt:
+                    if moving():
+                        stop()
+                    else:
+                        is_input = False
+            try:
+                # Let the last moves finish
+                for st in statuses:
+                    if st is not None:
+                        st.wait()
+            except KeyboardInterrupt:
+                stop()
+            except Exception:
+                logger.debug('Error in tweak move', exc_info=True)
+            show_status()
+    finally:
+        for mot, cid in subscriptions:
+            mot.unsubscribe(cid)
     print()
     logger.info('Tweak complete')
 
@@ -1410,8 +2344,8 @@ def tweak_base(*args):
 class AbsProgressBar(ProgressBar):
     """Progress bar that displays the absolute position as well."""
     def __init__(self, *args, **kwargs):
-        self._last_position = None
-        self._name = None
+        self._last_position = {}
+        self._name = {}
         self._no_more = False
         self._manual_cbs = []
         self.has_updated = False
@@ -1422,17 +2356,18 @@ class AbsProgressBar(ProgressBar):
             self._manual_cbs.append(functools.partial(self._status_cb, i))
 
     def _status_cb(self, pos, status):
-        self.update(pos, name=self._name, current=self._last_position)
+        self.update(pos, name=self._name.get(pos),
+                    current=self._last_position.get(pos))
 
-    def update(self, *args, name=None, current=None, **kwargs):
+    def update(self, pos, *args, name=None, current=None, **kwargs):
         # Escape hatch to avoid post-command prints
         if self._no_more:
             return
 
         # Get cached position and name so they can always be displayed
-        current = current or self._last_position
-        self._name = self._name or name
-        name = self._name
+        current = current or self._last_position.get(pos)
+        self._name[pos] = self._name.get(pos) or name
+        name = self._name[pos]
 
         try:
             if isinstance(current, typing.Sequence):
@@ -1450,14 +2385,14 @@ class AbsProgressBar(ProgressBar):
                 fmt = '{}: ({:.4f})'
 
             name = fmt.format(name, current)
-            self._last_position = current
+            self._last_position[pos] = current
         except Exception:
             # Fallback if there is no position data at all
-            name = name or self._name or 'motor'
+            name = name or self._name.get(pos) or 'motor'
 
         try:
             # Actually draw the bar
-            super().update(*args, name=name, current=current, **kwargs)
+            super().update(pos, *args, name=name, current=current, **kwargs)
             if not self._no_more:
                 self.has_updated = True
         except Exception:
@@ -1499,8 +2434,11 @@ class LightpathMixin(OphydObject):
 
     def __init__(self, *args, **kwargs):
         self._lightpath_values = {}
+        # Components with new values since they were last evaluated
+        self._lightpath_changed = set()
         self._lightpath_ready = False
         self._retry_lightpath = False
+        self._lightpath_summary = None
         super().__init__(*args, **kwargs)
 
     def __init_subclass__(cls, **kwargs):
@@ -1524,9 +2462,13 @@ class LightpathMixin(OphydObject):
         raise NotImplementedError('Did not implement LightpathMixin')
 
     def _update_lightpath(self, *args, obj, **kwargs):
+        # Universally cache values
+        self._lightpath_values[obj] = kwargs
+        self._lightpath_changed.add(obj)
+        self._evaluate_lightpath()
+
+    def _evaluate_lightpath(self):
         try:
-            # Universally cache values
-            self._lightpath_values[obj] = kwargs
             # Only do the first lightpath state once all cpts have chimed in
             if len(self._lightpath_values) >= len(self.lightpath_cpts):
                 self._retry_lightpath = False
@@ -1534,14 +2476,17 @@ class LightpathMixin(OphydObject):
                 self._set_lightpath_states(self._lightpath_values)
                 self._lightpath_ready = not self._retry_lightpath
                 if self._lightpath_ready:
-                    # Tell lightpath to update
-                    self._run_subs(sub_type=self.SUB_STATE)
+                    # Tell lightpath to update, but only if something changed
+                    summary = (self.inserted, self.removed, self.transmission)
+                    if summary != self._lightpath_summary:
+                        self._lightpath_summary = summary
+                        self._run_subs(sub_type=self.SUB_STATE)
                 elif self._retry_lightpath and not self._destroyed:
                     # Use this when the device wasn't ready to set states
-                    kw = dict(obj=obj)
-                    kw.update(kwargs)
-                    utils.schedule_task(self._update_lightpath,
-                                        args=args, kwargs=kw, delay=0.2)
+                    # Retries re-use the latest cached values, so one pending
+                    # retry per device is enough
+                    utils.schedule_task(self._evaluate_lightpath, delay=0.2,
+                                        key=(self, '_evaluate_lightpath'))
         except Exception:
             # Without this, callbacks fail silently
             logger.exception('Error in lightpath update callback for %s.',
@@ -1573,29 +2518,46 @@ class LightpathInOutMixin(LightpathMixin):
     """
     _lightpath_mixin = True
 
+    def __init__(self, *args, **kwargs):
+        # Per-component (inserted, removed, transmission)
+        self._lightpath_contributions = {}
+        self._lightpath_stale = True
+        super().__init__(*args, **kwargs)
+
     def _set_lightpath_states(self, lightpath_values):
-        in_check = []
-        out_check = []
-        trans_check = []
-        for obj, kwarg_dct in lightpath_values.items():
+        # Only the components with new values are checked again
+        for obj in list(self._lightpath_changed):
+            self._lightpath_changed.discard(obj)
+            kwarg_dct = lightpath_values[obj]
             if isinstance(obj, LightpathInOutMixin):
                 # The inserted/removed are always just a getattr
                 # Therefore, they are safe to call in a callback
-                in_check.append(obj.inserted)
-                out_check.append(obj.removed)
-                trans_check.append(obj.transmission)
+                contribution = (obj.inserted, obj.removed, obj.transmission)
             else:
                 if not obj._state_initialized:
                     # This would prevent make check_inserted, etc. fail
+                    self._lightpath_changed.add(obj)
                     self._retry_lightpath = True
                     return
                 # Inserted/removed are not getattr, they can check EPICS
                 # Instead, check status against the callback kwarg dict
-                in_check.append(obj.check_inserted(kwarg_dct['value']))
-                out_check.append(obj.check_removed(kwarg_dct['value']))
-                trans_check.append(obj.check_transmission(kwarg_dct['value']))
+                value = kwarg_dct['value']
+                contribution = (obj.check_inserted(value),
+                                obj.check_removed(value),
+                                obj.check_transmission(value))
+            if contribution != self._lightpath_contributions.get(obj):
+                self._lightpath_contributions[obj] = contribution
+                self._lightpath_stale = True
+        if not self._lightpath_stale:
+            # Nothing to recompute
+            return None
+        self._lightpath_stale = False
+        contributions = list(self._lightpath_contributions.values())
+        in_check = [contribution[0] for contribution in contributions]
+        out_check = [contribution[1] for contribution in contributions]
+        trans_check = [contribution[2] for contribution in contributions]
         self._inserted = any(in_check)
         self._removed = all(out_check)
-        self._transmission = functools.reduce(lambda a, b: a*b, trans_check)
+        self._transmission = functools.reduce(operator.mul, trans_check)
         return dict(in_check=in_check, out_check=out_check,
                     trans_check=trans_check)
@@ -11,8 +11,12 @@ if __name__ != 'pcdsdevices.signal':
                        'elsewhere for better results.')
 import logging
 import numbers
+import operator
+import time
 import typing
-from threading import RLock
+import weakref
+from collections import deque
+from threading import Lock, RLock
 
 import numpy as np
 from ophyd.signal import (DerivedSignal, EpicsSignal, EpicsSignalBase,
@@ -20,10 +24,16 @@ from ophyd.signal import (DerivedSignal, EpicsSignal, EpicsSignalBase,
 from ophyd.sim import FakeEpicsSignal, FakeEpicsSignalRO, fake_device_cache
 from pytmc.pragmas import normalize_io
 
-from .utils import convert_unit
+from .utils import convert_unit, get_thread_pool, in_thread_pool, schedule_task
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of simultaneous sub-signal reads for AggregateSignal.get
+aggregate_get_workers = 8
+
+# Default for keyword arguments where None is a valid setting
+_class_default = object()
+
 
 class PytmcSignal(EpicsSignalBase):
     """
@@ -127,16 +137,40 @@ class AggregateSignal(Signal):
 
     _sub_signals : list
         Signals that contribute to this signal.
+
+    coalesce_delay : float or None
+        If `None` (default), recalculate and run subscriptions for every
+        sub-signal update. Otherwise, collect the sub-signal updates that
+        arrive within this many seconds and recalculate once at the end,
+        skipping intermediate states. With ``0``, this collects the updates
+        already waiting in the same callback queue. Can be set per instance
+        with the ``coalesce_delay`` keyword argument, which is also how a
+        ``Component`` opts in, or out with ``coalesce_delay=None``.
+
+    parallel_get : bool
+        If `True`, `get` reads all the sub-signals at the same time from a
+        shared thread pool, then updates the cache in one step. Default is
+        `False`, one read after the other. Can be set per instance with the
+        ``parallel_get`` keyword argument.
     """
 
     _update_only_on_change = True
+    coalesce_delay = None
+    parallel_get = False
 
-    def __init__(self, *, name, **kwargs):
+    def __init__(self, *, name, coalesce_delay=_class_default,
+                 parallel_get=None, **kwargs):
         super().__init__(name=name, **kwargs)
+        if coalesce_delay is not _class_default:
+            self.coalesce_delay = coalesce_delay
+        if parallel_get is not None:
+            self.parallel_get = parallel_get
         self._cache = {}
         self._has_subscribed = False
         self._lock = RLock()
         self._sub_signals = []
+        self._update_pending = False
+        self._pending_old_value = None
 
     def _calc_readback(self):
         """
@@ -165,6 +199,12 @@ class AggregateSignal(Signal):
 
     def get(self, **kwargs):
         """Update all values and recalculate."""
+        if self.parallel_get and len(self._sub_signals) > 1:
+            values = _get_all(self._sub_signals, **kwargs)
+            with self._lock:
+                self._cache.update(zip(self._sub_signals, values))
+                self._update_state()
+                return self._readback
         with self._lock:
             for signal in self._sub_signals:
                 self._cache[signal] = signal.get(**kwargs)
@@ -194,6 +234,9 @@ class AggregateSignal(Signal):
         sig = kwargs.pop('obj')
         kwargs.pop('old_value')
         value = kwargs['value']
+        if self.coalesce_delay is not None:
+            self._queue_value(sig, value)
+            return
         with self._lock:
             old_value = self._readback
             # Update just one value and assume the rest are cached
@@ -203,6 +246,54 @@ class AggregateSignal(Signal):
                 self._run_subs(sub_type=self.SUB_VALUE, obj=self, value=value,
                                old_value=old_value)
 
+    def _queue_value(self, signal, value):
+        """Cache one value and schedule a single recalculation."""
+        with self._lock:
+            self._cache[signal] = value
+            if self._update_pending:
+                return
+            self._update_pending = True
+            self._pending_old_value = self._readback
+        schedule_task(self._run_pending_update,
+                      delay=self.coalesce_delay or None)
+
+    def _run_pending_update(self):
+        """Recalculate once for all the values queued since the last time."""
+        with self._lock:
+            self._update_pending = False
+            old_value = self._pending_old_value
+            self._update_state()
+            value = self._readback
+            if value != old_value or not self._update_only_on_change:
+                self._run_subs(sub_type=self.SUB_VALUE, obj=self, value=value,
+                               old_value=old_value)
+
+
+def _get_all(signals, **kwargs):
+    """Call ``get`` on all of the signals at once, returning the values."""
+    if in_thread_pool('pcdsdevices_aggregate'):
+        # Nested aggregate, waiting on the pool from inside could deadlock
+        return [signal.get(**kwargs) for signal in signals]
+    pool = get_thread_pool('pcdsdevices_aggregate', aggregate_get_workers)
+    futures = [pool.submit(signal.get, **kwargs) for signal in signals[1:]]
+    # Use the calling thread for one of them rather than waiting idle
+    values = [signals[0].get(**kwargs)]
+    values.extend(future.result() for future in futures)
+    return values
+
+
+def _get_sibling(parent, attr):
+    """
+    Get the sibling signal called ``attr``.
+
+    Given as the suffix of a ``Cpt``, the name arrives with the parent's
+    prefix in front, which is removed here.
+    """
+    prefix = getattr(parent, 'prefix', '')
+    if prefix and attr.startswith(prefix) and not hasattr(type(parent), attr):
+        attr = attr[len(prefix):]
+    return getattr(parent, attr)
+
 
 class AvgSignal(Signal):
     """
@@ -217,6 +308,10 @@ class AvgSignal(Signal):
     Warning: this means that if we only have recieved ONE value, the mean will
     just be the mean of a single value!
 
+    Running sums are kept as values enter and leave the buffer, so each update
+    costs the same regardless of the buffer size. ``nan`` values take up a
+    slot in the buffer but are left out of all the statistics.
+
     Parameters
     ----------
     signal : Signal
@@ -231,7 +326,7 @@ class AvgSignal(Signal):
     def __init__(self, signal, averages, *, name, parent=None, **kwargs):
         super().__init__(name=name, parent=parent, **kwargs)
         if isinstance(signal, str):
-            signal = getattr(parent, signal)
+            signal = _get_sibling(parent, signal)
         self.raw_sig = signal
         self._lock = RLock()
         self.averages = averages
@@ -256,14 +351,452 @@ class AvgSignal(Signal):
             self.values = np.empty(avg)
             # Fill with nan
             self.values.fill(np.nan)
+            self._reset_stats()
+
+    def _reset_stats(self):
+        """Clear the running sums and the min/max windows."""
+        self._count = 0
+        # Sums are of (value - shift) to limit floating point cancellation
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        # Number of values seen, used to expire min/max candidates
+        self._seq = 0
+        # Candidates as (seq, value), values increasing/decreasing
+        self._min_queue = deque()
+        self._max_queue = deque()
+
+    def _resync_stats(self):
+        """Recompute the running sums from the buffer to shed rounding."""
+        valid = self.values[~np.isnan(self.values)]
+        self._count = len(valid)
+        if self._count:
+            self._shift = float(valid.mean())
+            diff = valid - self._shift
+            self._sum = float(diff.sum())
+            self._sum_sq = float(np.dot(diff, diff))
+        else:
+            self._shift = self._sum = self._sum_sq = 0.0
 
     def _update_avg(self, *args, value, **kwargs):
         """Add new value to the buffer, overriding old values if needed."""
         with self._lock:
+            old = self.values[self.index]
             self.values[self.index] = value
+            value = self.values[self.index]
+            if not np.isnan(old):
+                self._count -= 1
+                diff = old - self._shift
+                self._sum -= diff
+                self._sum_sq -= diff * diff
+            if not np.isnan(value):
+                if not self._count:
+                    self._shift = value
+                    self._sum = self._sum_sq = 0.0
+                self._count += 1
+                diff = value - self._shift
+                self._sum += diff
+                self._sum_sq += diff * diff
+            self._update_extrema(value)
             self.index = (self.index + 1) % len(self.values)
-            # This takes a mean, skipping nan values.
-            self.put(np.nanmean(self.values))
+            if self.index == 0:
+                # Once per pass over the buffer, amortized O(1)
+                self._resync_stats()
+            self.put(self.mean)
+
+    def _update_extrema(self, value):
+        """Keep the monotonic queues for the window min and max."""
+        self._seq += 1
+        expired = self._seq - len(self.values)
+        for queue, drop in ((self._min_queue, operator.ge),
+                            (self._max_queue, operator.le)):
+            if not np.isnan(value):
+                while queue and drop(queue[-1][1], value):
+                    queue.pop()
+                queue.append((self._seq, value))
+            while queue and queue[0][0] <= expired:
+                queue.popleft()
+
+    @property
+    def count(self):
+        """The number of non-nan values in the buffer."""
+        return self._count
+
+    @property
+    def mean(self):
+        """The mean of the buffer, skipping nan values."""
+        with self._lock:
+            if not self._count:
+                return np.nan
+            return self._shift + self._sum / self._count
+
+    @property
+    def variance(self):
+        """The population variance of the buffer, skipping nan values."""
+        with self._lock:
+            if not self._count:
+                return np.nan
+            mean_diff = self._sum / self._count
+            return max(self._sum_sq / self._count - mean_diff ** 2, 0.0)
+
+    @property
+    def std(self):
+        """The population standard deviation of the buffer."""
+        return np.sqrt(self.variance)
+
+    @property
+    def min(self):
+        """The smallest value in the buffer, skipping nan values."""
+        with self._lock:
+            if not self._min_queue:
+                return np.nan
+            return self._min_queue[0][1]
+
+    @property
+    def max(self):
+        """The largest value in the buffer, skipping nan values."""
+        with self._lock:
+            if not self._max_queue:
+                return np.nan
+            return self._max_queue[0][1]
+
+
+class SampleBuffer:
+    """
+    Preallocated ring buffer of a signal's values and their timestamps.
+
+    All the statistics signals that watch the same signal share one buffer,
+    see `SampleBuffer.for_signal`. Samples are numbered from zero in arrival
+    order, and sample ``num`` is stored at ``num % size``.
+
+    Parameters
+    ----------
+    signal : Signal
+        The signal to record values from.
+
+    size : int
+        The number of samples to keep.
+    """
+    _buffers = weakref.WeakKeyDictionary()
+    _buffers_lock = Lock()
+
+    def __init__(self, signal, size):
+        self._lock = RLock()
+        self._stats = []
+        self.count = 0
+        self._allocate(size)
+        signal.subscribe(self._new_value)
+
+    @classmethod
+    def for_signal(cls, signal, size):
+        """
+        Get the shared buffer for ``signal``, holding at least ``size``.
+
+        An existing buffer that is too small is grown to ``size``.
+        """
+        with cls._buffers_lock:
+            buffer = cls._buffers.get(signal)
+            if buffer is None:
+                buffer = cls(signal, size)
+                cls._buffers[signal] = buffer
+            elif buffer.size < size:
+                buffer._allocate(size)
+        return buffer
+
+    def _allocate(self, size):
+        with self._lock:
+            values = np.full(size, np.nan)
+            timestamps = np.full(size, np.nan)
+            if self.count:
+                # Move the samples we still have to their new slots
+                first = max(0, self.count - min(size, self.size))
+                nums = np.arange(first, self.count)
+                values[nums % size] = self.values[nums % self.size]
+                timestamps[nums % size] = self.timestamps[nums % self.size]
+            self.size = size
+            self.values = values
+            self.timestamps = timestamps
+
+    def add_stats(self, stats):
+        """Call ``stats._new_sample`` whenever a sample arrives."""
+        with self._lock:
+            self._stats.append(stats)
+
+    def remove_stats(self, stats):
+        with self._lock:
+            self._stats.remove(stats)
+
+    def value(self, num):
+        """The value of sample ``num``, which must still be in the buffer."""
+        return self.values[num % self.size]
+
+    def timestamp(self, num):
+        """The timestamp of sample ``num``."""
+        return self.timestamps[num % self.size]
+
+    def last(self, count):
+        """Copy of the last ``count`` values, oldest first."""
+        with self._lock:
+            count = min(count, self.count, self.size)
+            nums = np.arange(self.count - count, self.count)
+            return self.values[nums % self.size]
+
+    def _new_value(self, *args, value, timestamp=None, **kwargs):
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            num = self.count
+            index = num % self.size
+            if num >= self.size:
+                dropped = self.values[index]
+            else:
+                dropped = np.nan
+            self.values[index] = value
+            self.timestamps[index] = timestamp
+            self.count += 1
+            results = [(stats, stats._new_sample(num, dropped))
+                       for stats in self._stats]
+        # Run subscriptions outside of the lock
+        for stats, result in results:
+            if result is not None:
+                stats.put(result)
+
+
+class _SampleStatsSignal(Signal):
+    """
+    Base class for signals that report statistics from a `SampleBuffer`.
+
+    Subclasses implement ``_new_sample``, which returns the new value or
+    `None` to keep the current one.
+
+    Parameters
+    ----------
+    signal : Signal or str
+        The numeric signal to watch, or the attribute name of a sibling.
+
+    buffer_size : int
+        The minimum number of samples the shared buffer must keep.
+    """
+
+    def __init__(self, signal, *, buffer_size, name, parent=None, **kwargs):
+        super().__init__(name=name, parent=parent, **kwargs)
+        if isinstance(signal, str):
+            signal = _get_sibling(parent, signal)
+        self.raw_sig = signal
+        self.buffer = SampleBuffer.for_signal(signal, buffer_size)
+        self.buffer.add_stats(self)
+
+    @property
+    def connected(self):
+        return self.raw_sig.connected
+
+    def _new_sample(self, num, dropped):
+        raise NotImplementedError('Subclasses must implement _new_sample')
+
+    def destroy(self):
+        self.buffer.remove_stats(self)
+        super().destroy()
+
+
+class TimeAvgSignal(_SampleStatsSignal):
+    """
+    Signal that is the mean of another signal over the last ``window`` seconds.
+
+    Samples are weighted equally and ``nan`` values are skipped. Each update
+    is O(1): a running sum is kept, and recomputed from the window once per
+    pass over the buffer to shed rounding errors.
+
+    Parameters
+    ----------
+    signal : Signal or str
+        The numeric signal to average, or the attribute name of a sibling.
+
+    window : float
+        The length of the window in seconds, counted back from the newest
+        sample's timestamp.
+
+    buffer_size : int, optional
+        The most samples the window can hold.
+    """
+
+    def __init__(self, signal, window, *, buffer_size=10000, name,
+                 parent=None, **kwargs):
+        self.window = window
+        self._first = 0
+        self._count = 0
+        self._sum = 0.0
+        self._since_resync = 0
+        super().__init__(signal, buffer_size=buffer_size, name=name,
+                         parent=parent, **kwargs)
+        self._first = self.buffer.count
+
+    @property
+    def count(self):
+        """The number of non-nan samples in the window."""
+        return self._count
+
+    def _new_sample(self, num, dropped):
+        buffer = self.buffer
+        if self._first < num + 1 - buffer.size:
+            # Oldest sample was overwritten, take it out using its old value
+            self._remove(dropped)
+            self._first += 1
+        self._add(buffer.value(num))
+        oldest = buffer.timestamp(num) - self.window
+        while self._first < num and buffer.timestamp(self._first) < oldest:
+            self._remove(buffer.value(self._first))
+            self._first += 1
+        self._since_resync += 1
+        if self._since_resync >= buffer.size:
+            # Once per pass over the buffer, amortized O(1)
+            self._resync_stats(num)
+        if not self._count:
+            return np.nan
+        return self._sum / self._count
+
+    def _resync_stats(self, num):
+        """Recompute the running sum from the window to shed rounding."""
+        nums = np.arange(self._first, num + 1)
+        values = self.buffer.values[nums % self.buffer.size]
+        valid = values[~np.isnan(values)]
+        self._count = len(valid)
+        self._sum = float(valid.sum())
+        self._since_resync = 0
+
+    def _add(self, value):
+        if not np.isnan(value):
+            self._count += 1
+            self._sum += value
+
+    def _remove(self, value):
+        if not np.isnan(value):
+            self._count -= 1
+            if self._count:
+                self._sum -= value
+            else:
+                # Start over to shed any rounding error
+                self._sum = 0.0
+
+
+class EwmaSignal(_SampleStatsSignal):
+    """
+    Signal that is an exponentially weighted moving average of another signal.
+
+    Each update moves the average by ``alpha`` times the difference to the new
+    value. ``nan`` values are skipped.
+
+    Parameters
+    ----------
+    signal : Signal or str
+        The numeric signal to average, or the attribute name of a sibling.
+
+    alpha : float, optional
+        The smoothing factor, between 0 and 1.
+
+    span : float, optional
+        Alternative to ``alpha``, the number of samples in a comparable
+        simple average. ``alpha = 2 / (span + 1)``.
+    """
+
+    def __init__(self, signal, alpha=None, *, span=None, name, parent=None,
+                 **kwargs):
+        if (alpha is None) == (span is None):
+            raise ValueError('Provide exactly one of alpha or span')
+        if alpha is None:
+            alpha = 2 / (span + 1)
+        if not 0 < alpha <= 1:
+            raise ValueError(f'alpha must be in (0, 1], got {alpha}')
+        self.alpha = alpha
+        self._average = np.nan
+        super().__init__(signal, buffer_size=1, name=name, parent=parent,
+                         **kwargs)
+
+    def _new_sample(self, num, dropped):
+        value = self.buffer.value(num)
+        if np.isnan(value):
+            return None
+        if np.isnan(self._average):
+            self._average = value
+        else:
+            self._average += self.alpha * (value - self._average)
+        return self._average
+
+
+class DecimatedAvgSignal(_SampleStatsSignal):
+    """
+    Signal that is the mean of each block of ``decimation`` samples.
+
+    This only updates once per block, so it slows down a fast signal.
+    ``nan`` values are skipped.
+
+    Parameters
+    ----------
+    signal : Signal or str
+        The numeric signal to average, or the attribute name of a sibling.
+
+    decimation : int
+        The number of samples in each block.
+    """
+
+    def __init__(self, signal, decimation, *, name, parent=None, **kwargs):
+        self.decimation = decimation
+        self._seen = 0
+        super().__init__(signal, buffer_size=decimation, name=name,
+                         parent=parent, **kwargs)
+
+    def _new_sample(self, num, dropped):
+        self._seen += 1
+        if self._seen < self.decimation:
+            return None
+        self._seen = 0
+        block = self.buffer.last(self.decimation)
+        block = block[~np.isnan(block)]
+        if not len(block):
+            return np.nan
+        return block.mean()
+
+
+class PercentileSignal(_SampleStatsSignal):
+    """
+    Signal that is a percentile of the last ``samples`` values of a signal.
+
+    ``nan`` values are skipped.
+
+    Parameters
+    ----------
+    signal : Signal or str
+        The numeric signal to watch, or the attribute name of a sibling.
+
+    percentile : float
+        The percentile to report, from 0 to 100.
+
+    samples : int
+        The number of recent samples to include.
+
+    every : int, optional
+        Only recompute once per this many samples, to save time on large
+        windows of fast signals.
+    """
+
+    def __init__(self, signal, percentile, samples, *, every=1, name,
+                 parent=None, **kwargs):
+        self.percentile = percentile
+        self.samples = samples
+        self.every = every
+        self._seen = 0
+        super().__init__(signal, buffer_size=samples, name=name,
+                         parent=parent, **kwargs)
+
+    def _new_sample(self, num, dropped):
+        self._seen += 1
+        if self._seen < self.every:
+            return None
+        self._seen = 0
+        window = self.buffer.last(self.samples)
+        window = window[~np.isnan(window)]
+        if not len(window):
+            return np.nan
+        return np.percentile(window, self.percentile)
 
 
 class NotImplementedSignal(SignalRO):
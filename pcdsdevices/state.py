@@ -1,8 +1,12 @@
 """
 Module to define positioners that move between discrete named states.
 """
+import copy
 import functools
+import itertools
 import logging
+import weakref
+from collections import OrderedDict
 from enum import Enum
 
 from ophyd.device import Component as Cpt
@@ -20,6 +24,9 @@ from .variety import set_metadata
 
 logger = logging.getLogger(__name__)
 
+# Map from each accepted int, str and alias to its state, for each states enum
+_state_maps = weakref.WeakKeyDictionary()
+
 
 class StatePositioner(MvInterface, Device, PositionerBase):
     """
@@ -74,12 +81,18 @@ class StatePositioner(MvInterface, Device, PositionerBase):
 
     egu = 'state'
 
+    # Shared across instances, keyed by class and states definition
+    _state_init_cache = {}
+    _states_enum_cache = {}
+
     def __init__(self, prefix, *, name, **kwargs):
         if self.__class__ is StatePositioner:
             raise TypeError(('StatePositioner must be subclassed with at '
                              'least a state signal'))
         self._state_initialized = False
         self._has_subscribed_state = False
+        # Display name for each state, see position
+        self._position_names = {}
         super().__init__(prefix, name=name, **kwargs)
         if self.states_list:
             self._state_init()
@@ -92,16 +105,37 @@ class StatePositioner(MvInterface, Device, PositionerBase):
     @required_for_connection
     def _state_init(self):
         if not self._state_initialized:
-            self._valid_states = [state for state in self.states_list
-                                  if state not in self._invalid_states
-                                  and state is not None]
-            if self._unknown:
-                self.states_list = [self._unknown] + self.states_list
-                self._invalid_states = [self._unknown] + self._invalid_states
+            key = (type(self), tuple(self.states_list),
+                   tuple(self._invalid_states), self._unknown)
+            try:
+                init = self._state_init_cache[key]
+            except KeyError:
+                init = self._create_state_init()
+                self._state_init_cache[key] = init
+            except TypeError:
+                init = self._create_state_init()
+            self.states_list, self._invalid_states, self._valid_states = init
             if not hasattr(self, 'states_enum'):
                 self.states_enum = self._create_states_enum()
             self._state_initialized = True
 
+    def _create_state_init(self):
+        """
+        Work out the full states_list, _invalid_states and _valid_states.
+
+        These are shared by all instances of the class with the same states,
+        so they must not be modified in place.
+        """
+        valid_states = [state for state in self.states_list
+                        if state not in self._invalid_states
+                        and state is not None]
+        states_list = self.states_list
+        invalid_states = self._invalid_states
+        if self._unknown:
+            states_list = [self._unknown] + states_list
+            invalid_states = [self._unknown] + invalid_states
+        return states_list, invalid_states, valid_states
+
     def _late_state_init(self, *args, enum_strs=None, **kwargs):
         if enum_strs is not None and not self.states_list:
             self.states_list = list(enum_strs)
@@ -204,15 +238,19 @@ class StatePositioner(MvInterface, Device, PositionerBase):
         Name of the positioner's current state. If aliases were provided, the
         first alias will be used instead of the base name.
         """
-        state = self.state.get()
-        state = self.get_state(state).name
+        state = self.get_state(self.state.get())
+        try:
+            return self._position_names[state]
+        except KeyError:
+            pass
         try:
-            alias = self._states_alias[state]
+            alias = self._states_alias[state.name]
             if isinstance(alias, list):
                 alias = alias[0]
-            return alias
         except KeyError:
-            return state
+            alias = state.name
+        self._position_names[state] = alias
+        return alias
 
     def check_value(self, value):
         """
@@ -243,6 +281,10 @@ class StatePositioner(MvInterface, Device, PositionerBase):
             meaningful fields, ``name`` and ``value``.
         """
 
+        try:
+            return self._get_state_map()[value]
+        except (KeyError, TypeError):
+            pass
         # Check for a malformed string digit
         if isinstance(value, str) and value.isdigit():
             value = int(value)
@@ -259,6 +301,31 @@ class StatePositioner(MvInterface, Device, PositionerBase):
                 raise ValueError(err.format(value, self.name, enum_names,
                                             enum_values))
 
+    def _get_state_map(self):
+        """
+        Get the map from every accepted int, str and alias to its state.
+
+        The map is built once per states enum and shared by every instance
+        using the same enum.
+        """
+        states_enum = self.states_enum
+        try:
+            return _state_maps[states_enum]
+        except KeyError:
+            pass
+        state_map = {}
+        for name, state in states_enum.__members__.items():
+            state_map[name] = state
+            state_map[state] = state
+        for state in states_enum:
+            state_map.setdefault(state.value, state)
+            # Digit strings are always values, as in the fallback below
+            digits = str(state.value)
+            if digits.isdigit():
+                state_map[digits] = state
+        _state_maps[states_enum] = state_map
+        return state_map
+
     def _do_move(self, state):
         """
         Execute the move command.
@@ -279,7 +346,24 @@ class StatePositioner(MvInterface, Device, PositionerBase):
         """
         Create an enum that can be used to keep track of aliases, state names,
         and integer enum values.
+
+        Instances of the same class with the same states and aliases share one
+        enum.
         """
+        try:
+            key = (type(self), tuple(self.states_list),
+                   tuple((state, tuple(aliases) if isinstance(aliases, list)
+                          else aliases)
+                         for state, aliases in self._states_alias.items()))
+            return self._states_enum_cache[key]
+        except KeyError:
+            enum = self._build_states_enum()
+            self._states_enum_cache[key] = enum
+            return enum
+        except TypeError:
+            return self._build_states_enum()
+
+    def _build_states_enum(self):
         state_def = {}
         state_count = 0
         for i, state in enumerate(self.states_list):
@@ -306,6 +390,90 @@ class StatePositioner(MvInterface, Device, PositionerBase):
         return enum
 
 
+class _StateDecisionTable:
+    """
+    Lookup table from sub-signal values to state for `PVStateSignal`.
+
+    Tables are shared between positioners with equal state logic. Every
+    combination of the values listed in ``_state_logic`` is evaluated up
+    front. Any other combination is evaluated the first time it is seen and
+    kept in a bounded least recently used cache.
+    """
+
+    # Bound on the number of stored combinations
+    max_size = 4096
+
+    def __init__(self, state_logic, mode, unknown):
+        # A copy, the table may outlive changes to the positioner's logic
+        state_logic = copy.deepcopy(state_logic)
+        self.mode = mode
+        self.unknown = unknown
+        self.signal_names = tuple(state_logic)
+        self._logic = tuple(state_logic.values())
+        self._table = {}
+        self._lazy = OrderedDict()
+        combinations = 1
+        for info in self._logic:
+            combinations *= len(info)
+        if combinations <= self.max_size:
+            for values in itertools.product(*self._logic):
+                self._table[values] = self.evaluate(values)
+
+    @staticmethod
+    def key(positioner):
+        """Hashable snapshot of the state logic of ``positioner``."""
+        logic = tuple((signal_name, tuple(info.items()))
+                      for signal_name, info in positioner._state_logic.items())
+        return logic, positioner._state_logic_mode, positioner._unknown
+
+    def lookup(self, values):
+        """Get the state for a tuple of values, in `signal_names` order."""
+        try:
+            return self._table[values]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable readback, can't be stored
+            return self.evaluate(values)
+        try:
+            self._lazy.move_to_end(values)
+            return self._lazy[values]
+        except KeyError:
+            pass
+        state = self.evaluate(values)
+        self._lazy[values] = state
+        if len(self._lazy) > self.max_size:
+            self._lazy.popitem(last=False)
+        return state
+
+    def evaluate(self, values):
+        """Work out the state for a tuple of values from the state logic."""
+        state_value = None
+        for info, value in zip(self._logic, values):
+            try:
+                signal_state = info[value]
+            # Handle unaccounted readbacks
+            except KeyError:
+                state_value = self.unknown
+                break
+            # Associate readback with device state
+            if signal_state != 'defer':
+                if state_value:
+                    # Handle inconsistent readbacks
+                    if signal_state != state_value:
+                        state_value = self.unknown
+                        break
+                else:
+                    # Set state to first non-deferred value
+                    state_value = signal_state
+                    if self.mode == 'ALL':
+                        continue
+                    elif self.mode == 'FIRST':
+                        break
+        # If all states deferred, report as unknown
+        return state_value or self.unknown
+
+
 class PVStateSignal(AggregateSignal):
     """
     Signal that implements the `PVStatePositioner` state logic.
@@ -313,8 +481,14 @@ class PVStateSignal(AggregateSignal):
     See `AggregateSignal` for more information.
     """
 
+    # Decision tables in use, by state logic snapshot
+    _decision_tables = weakref.WeakValueDictionary()
+
     def __init__(self, *, name, **kwargs):
         super().__init__(name=name, **kwargs)
+        self._decision_table = None
+        # (state logic, version, mode, unknown) the table was picked for
+        self._decision_check = None
         self._sub_map = {}
         for signal_name in self.parent._state_logic.keys():
             sig = self.parent
@@ -333,33 +507,34 @@ class PVStateSignal(AggregateSignal):
                                    for state in self.parent.states_enum)}
         return {self.name: desc}
 
+    def _get_decision_table(self):
+        parent = self.parent
+        check = self._decision_check
+        if (check is None
+                or check[0] is not parent._state_logic
+                or check[1] != parent._state_logic_version
+                or check[2] != parent._state_logic_mode
+                or check[3] != parent._unknown):
+            key = _StateDecisionTable.key(parent)
+            table = self._decision_tables.get(key)
+            if table is None:
+                table = _StateDecisionTable(parent._state_logic,
+                                            parent._state_logic_mode,
+                                            parent._unknown)
+                self._decision_tables[key] = table
+            self._decision_table = table
+            self._decision_check = (parent._state_logic,
+                                    parent._state_logic_version,
+                                    parent._state_logic_mode,
+                                    parent._unknown)
+        return self._decision_table
+
     def _calc_readback(self):
-        state_value = None
-        for signal_name, info in self.parent._state_logic.items():
-            # Get last cached value
-            value = self._cache[self._sub_map[signal_name]]
-            try:
-                signal_state = info[value]
-            # Handle unaccounted readbacks
-            except KeyError:
-                state_value = self.parent._unknown
-                break
-            # Associate readback with device state
-            if signal_state != 'defer':
-                if state_value:
-                    # Handle inconsistent readbacks
-                    if signal_state != state_value:
-                        state_value = self.parent._unknown
-                        break
-                else:
-                    # Set state to first non-deferred value
-                    state_value = signal_state
-                    if self.parent._state_logic_mode == 'ALL':
-                        continue
-                    elif self.parent._state_logic_mode == 'FIRST':
-                        break
-        # If all states deferred, report as unknown
-        return state_value or self.parent._unknown
+        table = self._get_decision_table()
+        # Last cached values, in the same order as the state logic
+        values = tuple(self._cache[self._sub_map[signal_name]]
+                       for signal_name in table.signal_names)
+        return table.lookup(values)
 
     def put(self, value, **kwargs):
         self.parent.move(value, **kwargs)
@@ -399,6 +574,10 @@ class PVStatePositioner(StatePositioner):
         state. You can set this to 'FIRST' instead to use the first state
         found while traversing the `_state_logic` tree. This means an earlier
         state definition can mask a later state definition.
+
+    _state_logic_version : int
+        Incremented by `state_logic_changed`. The compiled state logic is
+        only rebuilt when `_state_logic` is replaced or this changes.
     """
 
     __doc__ = __doc__ % basic_positioner_init
@@ -407,6 +586,7 @@ class PVStatePositioner(StatePositioner):
 
     _state_logic = {}
     _state_logic_mode = 'ALL'
+    _state_logic_version = 0
 
     def __init__(self, prefix, *, name, **kwargs):
         if self.__class__ is PVStatePositioner:
@@ -422,6 +602,15 @@ class PVStatePositioner(StatePositioner):
                             self.states_list.append(state_name)
         super().__init__(prefix, name=name, **kwargs)
 
+    def state_logic_changed(self):
+        """
+        Rebuild the compiled state logic after editing it in place.
+
+        Replacing `_state_logic` is noticed on its own, but changes made
+        inside the dictionary need this call.
+        """
+        self._state_logic_version += 1
+
     def _do_move(self, state):
         raise NotImplementedError(('Class must implement a _do_move method or '
                                    'override the move and set methods'))
@@ -449,11 +638,14 @@ class StateRecordPositionerBase(StatePositioner):
     def get_state(self, value):
         if not self._has_checked_state_enum:
             # Add the real enum as the first alias
+            # Copy so that we don't add to the class attribute every time
+            states_alias = dict(self._states_alias)
             for enum_val, state in zip(self.state.enum_strs, self.states_list):
-                aliases = self._states_alias.get(state, [])
+                aliases = states_alias.get(state, [])
                 if isinstance(aliases, str):
                     aliases = [aliases]
-                self._states_alias[state] = [enum_val] + aliases
+                states_alias[state] = [enum_val] + aliases
+            self._states_alias = states_alias
             self.states_enum = self._create_states_enum()
             self._has_checked_state_enum = True
         return super().get_state(value)
@@ -1,15 +1,20 @@
 """
 Module for common target stage stack configurations.
 """
+import hashlib
 import logging
+import os
 import numpy as np
+from collections import namedtuple
 from datetime import datetime
 
+import bluesky.plan_stubs as bps
+import bluesky.preprocessors as bpp
 from ophyd.device import Device
+from ophyd.status import wait as status_wait
 import json
 import jsonschema
 import yaml
-from itertools import chain
 
 from pcdsdevices.epics_motor import _GetMotorClass
 from .interface import tweak_base
@@ -17,6 +22,9 @@ from .interface import tweak_base
 
 logger = logging.getLogger(__name__)
 
+# One target of a saved sample, see XYGridStage.iter_targets
+Target = namedtuple('Target', ['index', 'm', 'n', 'x', 'y'])
+
 
 def StageStack(mdict, name):
     """
@@ -270,6 +278,321 @@ class XYTargetGrid():
         self.y.mv(ypos, wait=wait)
 
 
+class YamlSampleStore():
+    """
+    Sample grids stored together in one ``yaml`` file.
+
+    Every target is saved as a ``{"pos", "status"}`` entry in the ``xx`` and
+    ``yy`` lists of its sample, so every change rewrites the whole file.
+    Use `NpySampleStore` for large grids.
+
+    Parameters
+    ----------
+    path : str
+        Path to the ``yaml`` file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _load(self):
+        with open(self.path) as sample_file:
+            try:
+                return yaml.safe_load(sample_file) or {}
+            except yaml.YAMLError as err:
+                logger.error('Error when loading the samples yaml file: %s',
+                             err)
+                raise err
+
+    def _dump(self, yaml_dict):
+        with open(self.path, 'w') as sample_file:
+            yaml.safe_dump(yaml_dict, sample_file,
+                           sort_keys=False, default_flow_style=False)
+
+    def samples(self):
+        """List the names of the saved samples."""
+        return list(self._load().keys())
+
+    def get_sample(self, sample_name):
+        """Get all the saved data for a sample, or `None`."""
+        return self._load().get(sample_name)
+
+    def get_info(self, sample_name):
+        """Get the data for a sample without the targets, or `None`."""
+        return self.get_sample(sample_name)
+
+    def get_positions(self, sample_name):
+        """Get the x and y positions of the targets as float arrays."""
+        sample = self._get_existing(self._load(), sample_name)
+        return (np.array([xd['pos'] for xd in sample['xx']], dtype=float),
+                np.array([yd['pos'] for yd in sample['yy']], dtype=float))
+
+    def save(self, sample_name, info, xx, yy):
+        """
+        Save a sample, keeping the statuses of a previous save if any.
+
+        Parameters
+        ----------
+        sample_name : str
+            The name of the sample.
+        info : dict
+            Everything to save for this sample except for the targets.
+        xx, yy : list of float
+            The x and y positions of the targets.
+        """
+        data = dict(info)
+        data['xx'] = [{"pos": float(x), "status": False} for x in xx]
+        data['yy'] = [{"pos": float(y), "status": False} for y in yy]
+        yaml_dict = self._load()
+        sample = yaml_dict.get(sample_name)
+        if sample:
+            # when overriding the same sample, this is assuming that a
+            # re-calibration was done - so keep the previous statuses.
+            for key in ('xx', 'yy'):
+                for new, old in zip(data[key], sample[key]):
+                    new['status'] = old['status']
+        yaml_dict[sample_name] = data
+        self._dump(yaml_dict)
+
+    def get_statuses(self, sample_name):
+        """Get the shot status of each target as a boolean array."""
+        sample = self._get_existing(self._load(), sample_name)
+        return np.array([xd['status'] for xd in sample['xx']], dtype=bool)
+
+    def set_statuses(self, sample_name, indices, status=True):
+        """Set the shot status of the targets at ``indices``."""
+        yaml_dict = self._load()
+        sample = self._get_existing(yaml_dict, sample_name)
+        for index in np.atleast_1d(indices):
+            sample['xx'][index]['status'] = bool(status)
+            sample['yy'][index]['status'] = bool(status)
+        self._dump(yaml_dict)
+
+    def reset_statuses(self, sample_name):
+        """Mark all the targets of a sample as not shot."""
+        yaml_dict = self._load()
+        sample = self._get_existing(yaml_dict, sample_name)
+        for key in ('xx', 'yy'):
+            for target in sample[key]:
+                target['status'] = False
+        self._dump(yaml_dict)
+
+    def _get_existing(self, yaml_dict, sample_name):
+        try:
+            return yaml_dict[sample_name]
+        except KeyError:
+            raise ValueError('Could not find this sample name in the file:'
+                             f' {sample_name}') from None
+
+
+class NpySampleStore():
+    """
+    Sample grids stored as per-sample arrays in a directory.
+
+    A small ``index.json`` holds the corners, coefficients and grid size of
+    each sample. The targets of each sample are kept in ``.npy`` arrays:
+    ``<sample>.xx.npy``, ``<sample>.yy.npy`` and ``<sample>.status.npy``.
+    Loading the information for a sample only reads the index, and marking
+    a target as shot writes a single byte of the memory-mapped status array.
+
+    Parameters
+    ----------
+    path : str
+        Path to the directory.
+    """
+
+    index_name = 'index.json'
+
+    def __init__(self, path):
+        self.path = path
+        self._index = None
+        self._index_key = None
+        self._statuses = {}
+
+    def _index_path(self):
+        return os.path.join(self.path, self.index_name)
+
+    def _array_path(self, sample_name, column):
+        if (not sample_name or os.sep in sample_name
+                or sample_name.startswith('.')):
+            raise ValueError(f'Invalid sample name {sample_name!r}')
+        return os.path.join(self.path, f'{sample_name}.{column}.npy')
+
+    @staticmethod
+    def _content_key(fd, text):
+        # Every save replaces the file, the inode catches identical rewrites
+        return (os.fstat(fd.fileno()).st_ino, hashlib.sha1(text).digest())
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), 'rb') as index_file:
+                text = index_file.read()
+                key = self._content_key(index_file, text)
+        except FileNotFoundError:
+            return {}
+        # Compared on content, an mtime may not change between two writes
+        if key != self._index_key:
+            self._index = json.loads(text)
+            self._index_key = key
+            # Arrays may have been replaced by someone else
+            self._statuses.clear()
+        return self._index
+
+    def _save_index(self, index):
+        temp = self._index_path() + '.tmp'
+        text = json.dumps(index, indent=1).encode('utf-8')
+        with open(temp, 'wb') as index_file:
+            index_file.write(text)
+            key = self._content_key(index_file, text)
+        os.replace(temp, self._index_path())
+        self._index = index
+        self._index_key = key
+
+    def _save_array(self, sample_name, column, array):
+        path = self._array_path(sample_name, column)
+        temp = path + '.tmp.npy'
+        np.save(temp, array)
+        os.replace(temp, path)
+
+    def samples(self):
+        """List the names of the saved samples."""
+        return list(self._load_index().keys())
+
+    def get_info(self, sample_name):
+        """Get the data for a sample without the targets, or `None`."""
+        return self._load_index().get(sample_name)
+
+    def get_positions(self, sample_name):
+        """Get the x and y positions of the targets as float arrays."""
+        return (np.load(self._array_path(sample_name, 'xx')),
+                np.load(self._array_path(sample_name, 'yy')))
+
+    def get_sample(self, sample_name):
+        """
+        Get all the saved data for a sample, or `None`.
+
+        The targets are returned in the same form as `YamlSampleStore`.
+        """
+        info = self.get_info(sample_name)
+        if info is None:
+            return None
+        data = dict(info)
+        xx, yy = self.get_positions(sample_name)
+        statuses = self.get_statuses(sample_name).tolist()
+        data['xx'] = [{"pos": x, "status": status}
+                      for x, status in zip(xx.tolist(), statuses)]
+        data['yy'] = [{"pos": y, "status": status}
+                      for y, status in zip(yy.tolist(), statuses)]
+        return data
+
+    def save(self, sample_name, info, xx, yy):
+        """
+        Save a sample, keeping the statuses of a previous save if any.
+
+        Parameters
+        ----------
+        sample_name : str
+            The name of the sample.
+        info : dict
+            Everything to save for this sample except for the targets.
+        xx, yy : array of float
+            The x and y positions of the targets.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        index = dict(self._load_index())
+        statuses = np.zeros(len(xx), dtype=bool)
+        if sample_name in index:
+            # Same as the yaml store, keep what overlaps
+            old = self.get_statuses(sample_name)
+            count = min(len(old), len(statuses))
+            statuses[:count] = old[:count]
+        self._statuses.pop(sample_name, None)
+        self._save_array(sample_name, 'xx', np.asarray(xx, dtype=float))
+        self._save_array(sample_name, 'yy', np.asarray(yy, dtype=float))
+        self._save_array(sample_name, 'status', statuses)
+        index[sample_name] = dict(info)
+        self._save_index(index)
+
+    def get_statuses(self, sample_name):
+        """
+        Get the shot status of each target as a boolean array.
+
+        This is a writable memory map of the file, kept open between calls.
+        """
+        self._load_index()
+        try:
+            return self._statuses[sample_name]
+        except KeyError:
+            pass
+        if sample_name not in self._index:
+            raise ValueError('Could not find this sample name in the store:'
+                             f' {sample_name}')
+        statuses = np.load(self._array_path(sample_name, 'status'),
+                           mmap_mode='r+')
+        self._statuses[sample_name] = statuses
+        return statuses
+
+    def set_statuses(self, sample_name, indices, status=True):
+        """Set the shot status of the targets at ``indices``."""
+        statuses = self.get_statuses(sample_name)
+        statuses[indices] = status
+        statuses.flush()
+
+    def reset_statuses(self, sample_name):
+        """Mark all the targets of a sample as not shot."""
+        statuses = self.get_statuses(sample_name)
+        statuses[:] = False
+        statuses.flush()
+
+
+def sample_store_for_path(path):
+    """
+    Pick the sample store that matches ``path``.
+
+    Existing directories use `NpySampleStore`, anything else is a
+    `YamlSampleStore` file. To start a new `NpySampleStore`, create an
+    empty directory for it.
+    """
+    path = str(path)
+    if os.path.isdir(path):
+        return NpySampleStore(path)
+    return YamlSampleStore(path)
+
+
+class GridCorners():
+    """
+    The four corners of a grid and their mapping coefficients.
+
+    Built in one go and not changed after, so the corners and coefficients
+    always match.
+
+    Parameters
+    ----------
+    top_left, top_right, bottom_right, bottom_left : tuple
+        (x, y) coordinates of the corners.
+
+    Attributes
+    ----------
+    corners : tuple
+        The four corners, in the order of the parameters.
+    a_coeffs, b_coeffs : np.ndarray
+        The `mesh_interpolation` coefficients for x and y.
+    """
+
+    def __init__(self, top_left, top_right, bottom_right, bottom_left):
+        self.corners = tuple(tuple(corner) for corner in
+                             (top_left, top_right, bottom_right, bottom_left))
+        self.a_coeffs, self.b_coeffs = mesh_interpolation(*self.corners)
+
+    @property
+    def coefficients(self):
+        """The coefficients as one list, the way samples save them."""
+        return self.a_coeffs.tolist() + self.b_coeffs.tolist()
+
+    def __repr__(self):
+        return f'{type(self).__name__}{self.corners}'
+
+
 class XYGridStage():
     """
     Class that helps support multiple samples on a mount for an XY Grid setup.
@@ -296,7 +619,8 @@ class XYGridStage():
         left corner of the desired sample grid.
     path : str
         Path to an `yaml` file where to save the grid patterns for
-        different samples.
+        different samples, or to a directory for a `NpySampleStore`. See
+        `sample_store_for_path`.
     """
 
     sample_schema = json.loads("""
@@ -319,6 +643,9 @@ class XYGridStage():
         "additionalProperties": true
     }
     """)
+    # The targets are checked separately, as float arrays
+    sample_info_schema = dict(sample_schema, required=[
+        key for key in sample_schema['required'] if key not in ('xx', 'yy')])
 
     def __init__(self, x_motor, y_motor, m_points, n_points, path):
         self._path = path
@@ -334,6 +661,12 @@ class XYGridStage():
         self._current_sample = ''
         self._positions_x = []
         self._positions_y = []
+        self._stores = {}
+        # Order and grid shape of positions_x and positions_y, see map_points
+        self._snake_like = True
+        self._mapped_shape = None
+        # (presets generations, GridCorners), see get_corners
+        self._corners = None
 
     @property
     def m_n_points(self):
@@ -417,8 +750,8 @@ class XYGridStage():
 
         Returns
         -------
-        positions_x : list
-            List of all target x positions mapped for a sample.
+        positions_x : np.ndarray or list
+            All target x positions mapped for a sample.
         """
         return self._positions_x
 
@@ -431,8 +764,8 @@ class XYGridStage():
 
         Returns
         -------
-        positions_y : list
-            List of all target y positions mapped for a sample.
+        positions_y : np.ndarray or list
+            All target y positions mapped for a sample.
         """
         return self._positions_y
 
@@ -450,6 +783,9 @@ class XYGridStage():
             List of all the x positions.
         """
         self._positions_x = x_positions
+        # Hand-set positions follow m_n_points and the default snake order
+        self._snake_like = True
+        self._mapped_shape = None
 
     @positions_y.setter
     def positions_y(self, y_positions):
@@ -465,6 +801,9 @@ class XYGridStage():
             List of all the y positions.
         """
         self._positions_y = y_positions
+        # Hand-set positions follow m_n_points and the default snake order
+        self._snake_like = True
+        self._mapped_shape = None
 
     def tweak(self):
         """
@@ -562,21 +901,53 @@ class XYGridStage():
             Four coordinate positions.
             (top_left, top_right, bottom_right, bottom_left)
         """
+        corners = self.get_corners()
+        if corners is None:
+            logger.warning('Could not get presets, try to set_presets.')
+            return None
+        return corners.corners
+
+    def get_corners(self):
+        """
+        Get the grid corners saved as presets, with their coefficients.
+
+        The presets are only read again after the presets of the x or y
+        motor are synced, e.g. when a corner is saved again.
+
+        Returns
+        -------
+        corners : GridCorners
+            The corners, or `None` if some presets are missing.
+        """
         try:
-            top_left = (self.x.presets.positions.x_top_left.pos,
-                        self.y.presets.positions.y_top_left.pos)
-            # corner (0, M)
-            top_right = (self.x.presets.positions.x_top_right.pos,
-                         self.y.presets.positions.y_top_right.pos)
-            # corner (M, N)
-            bottom_right = (self.x.presets.positions.x_bottom_right.pos,
-                            self.y.presets.positions.y_bottom_right.pos)
-            # corner (N, 0)
-            bottom_left = (self.x.presets.positions.x_bottom_left.pos,
-                           self.y.presets.positions.y_bottom_left.pos)
-            return top_left, top_right, bottom_right, bottom_left
+            presets = (self.x.presets, self.y.presets)
+            key = tuple((preset, preset.generation) for preset in presets)
+        except AttributeError:
+            key = None
+        if key is not None and self._corners is not None:
+            old_key, corners = self._corners
+            if old_key == key:
+                return corners
+        corners = self._load_corners()
+        if key is not None:
+            self._corners = (key, corners)
+        return corners
+
+    def _load_corners(self):
+        try:
+            x_positions = self.x.presets.positions
+            y_positions = self.y.presets.positions
+            # corners (0, 0), (0, M), (M, N), (N, 0)
+            return GridCorners(
+                (x_positions.x_top_left.pos, y_positions.y_top_left.pos),
+                (x_positions.x_top_right.pos, y_positions.y_top_right.pos),
+                (x_positions.x_bottom_right.pos,
+                 y_positions.y_bottom_right.pos),
+                (x_positions.x_bottom_left.pos,
+                 y_positions.y_bottom_left.pos))
         except Exception:
-            logger.warning('Could not get presets, try to set_presets.')
+            logger.debug('Could not load the grid corners', exc_info=True)
+            return None
 
     def get_samples(self, path=None):
         """
@@ -587,18 +958,20 @@ class XYGridStage():
         samples : list
             List of strings of all the sample names available.
         """
-        path = path or self._path
-        with open(path) as sample_file:
-            try:
-                data = yaml.safe_load(sample_file)
-                if not data:
-                    logger.info('The file is empty, no samples saved yet.')
-                    return []
-                return list(data.keys())
-            except yaml.YAMLError as err:
-                logger.error('Error when loading the samples yaml file: %s',
-                             err)
-                raise err
+        samples = self._get_store(path).samples()
+        if not samples:
+            logger.info('The file is empty, no samples saved yet.')
+        return samples
+
+    def _get_store(self, path=None):
+        """Get the sample store for ``path``, defaulting to our path."""
+        path = str(path or self._path)
+        try:
+            return self._stores[path]
+        except KeyError:
+            store = sample_store_for_path(path)
+            self._stores[path] = store
+            return store
 
     def get_current_sample(self):
         """
@@ -687,26 +1060,12 @@ class XYGridStage():
         yy:
         ...}
         """
-        path = path or self._path
-        data = None
-        with open(path) as sample_file:
-            try:
-                data = yaml.safe_load(sample_file)
-            except yaml.YAMLError as err:
-                logger.error('Error when loading the samples yaml file: %s',
-                             err)
-                raise err
-        if data is None:
-            logger.warning('The file is empty, no sample grid yet. '
-                           'Please use `save_presets` to insert grids '
-                           'in the file.')
-            return {}
-        try:
-            return data[str(sample_name)]
-        except Exception:
+        data = self._get_store(path).get_sample(str(sample_name))
+        if not data:
             logger.error('The sample %s might not exist in the file.',
                          sample_name)
             return {}
+        return data
 
     def get_sample_map_info(self, sample_name, path=None):
         """
@@ -720,8 +1079,7 @@ class XYGridStage():
         path : str, optional
             Path to the samples yaml file.
         """
-        path = path or self._path
-        sample = self.get_sample_data(str(sample_name))
+        sample = self._get_store(path).get_info(str(sample_name))
         coeffs = []
         m_points, n_points = 0, 0
         if sample:
@@ -755,6 +1113,9 @@ class XYGridStage():
         needed for that sample, so in case we have already shot targets from
         that sample - we want to keep track of that.
 
+        The number of rows and columns saved are the ones the points were
+        mapped with, see `map_points`.
+
         Parameters
         ----------
         sample_name : str
@@ -763,65 +1124,51 @@ class XYGridStage():
             Path to the `.yml` file. Defaults to the path defined when
             creating this object.
 
+        Raises
+        ------
+        ValueError
+            If the number of positions doesn't match the grid size.
+
         Examples
         --------
         >>> save_grid('sample_1')
         """
-        path = path or self._path
         now = str(datetime.now())
         top_left, top_right, bottom_right, bottom_left = [], [], [], []
-        flat_xx, flat_yy = [], []
-        if self.get_presets():
-            top_left, top_right, bottom_right, bottom_left = self.get_presets()
+        presets = self.get_presets()
+        if presets:
+            top_left, top_right, bottom_right, bottom_left = presets
         xx, yy = self.positions_x, self.positions_y
-        if xx and yy:
-            flat_xx = [float(x) for x in xx]
-            flat_yy = [float(y) for y in yy]
-            # add False to each target to indicate they
-            # have not been shot yet
-            flat_xx = [{"pos": x, "status": False} for x in flat_xx]
-            flat_yy = [{"pos": y, "status": False} for y in flat_yy]
+        if not (len(xx) and len(yy)):
+            xx, yy = [], []
         m_points, n_points = self.m_n_points
+        if len(xx):
+            # Save the shape that was mapped, target_index relies on it
+            m_points, n_points = self._mapped_shape or (m_points, n_points)
+            if not len(xx) == len(yy) == m_points * n_points:
+                raise ValueError(f'Expected {m_points} x {n_points} targets '
+                                 f'for this grid, got {len(xx)} x positions '
+                                 f'and {len(yy)} y positions.')
         coefficients = self.coefficients
-        data = {sample_name: {"time_created": now,
-                              "top_left": list(top_left),
-                              "top_right": list(top_right),
-                              "bottom_right": list(bottom_right),
-                              "bottom_left": list(bottom_left),
-                              "M": m_points,  # number of rows
-                              "N": n_points,  # number of columns
-                              "coefficients": coefficients,
-                              "xx": flat_xx,
-                              "yy": flat_yy}}
+        info = {"time_created": now,
+                "top_left": list(top_left),
+                "top_right": list(top_right),
+                "bottom_right": list(bottom_right),
+                "bottom_left": list(bottom_left),
+                "M": m_points,  # number of rows
+                "N": n_points,  # number of columns
+                "coefficients": coefficients,
+                # order of the targets, see target_index
+                "snake_like": bool(self._snake_like)}
         try:
-            jsonschema.validate(data[sample_name], self.sample_schema)
+            jsonschema.validate(info, self.sample_info_schema)
         except jsonschema.exceptions.ValidationError as err:
             logger.warning('Invalid input: %s', err)
             raise err
         # override the existing sample grids or append other grids
-        # check to see if sample exists already
-        with open(path) as sample_file:
-            yaml_dict = yaml.safe_load(sample_file) or {}
-            sample = yaml_dict.get(sample_name)
-            if sample:
-                # when overriding the same sample, this is assuming that a
-                # re-calibration was done - so keep the previous statuses.
-                temp_xx = sample['xx']
-                temp_yy = sample['yy']
-                temp_x_status = [i['status'] for i in temp_xx]
-                temp_y_status = [i['status'] for i in temp_yy]
-                for xd, status in zip(data[sample_name]['xx'], temp_x_status):
-                    xd.update((k, status)
-                              for k, v in xd.items() if k == 'status')
-                for yd, status in zip(data[sample_name]['yy'], temp_y_status):
-                    yd.update((k, status)
-                              for k, v in yd.items() if k == 'status')
-                yaml_dict.update(data)
-            else:
-                yaml_dict.update(data)
-        with open(path, 'w') as sample_file:
-            yaml.safe_dump(yaml_dict, sample_file,
-                           sort_keys=False, default_flow_style=False)
+        self._get_store(path).save(sample_name, info,
+                                   np.asarray(xx, dtype=float),
+                                   np.asarray(yy, dtype=float))
 
     def reset_statuses(self, sample_name, path=None):
         """
@@ -835,24 +1182,7 @@ class XYGridStage():
             Path to the `.yml` file. Defaults to the path defined when
             creating this object.
         """
-        path = path or self._path
-        with open(path) as sample_file:
-            yaml_dict = yaml.safe_load(sample_file) or {}
-            sample = yaml_dict.get(sample_name)
-            if sample:
-                for xd in sample.get('xx'):
-                    xd.update((k, False)
-                              for k, v in xd.items() if k == 'status')
-                for yd in sample.get('yy'):
-                    yd.update((k, False)
-                              for k, v in yd.items() if k == 'status')
-                yaml_dict[sample_name].update(sample)
-            else:
-                raise ValueError('Could not find this sample name in the file:'
-                                 f' {sample}')
-        with open(path, 'w') as sample_file:
-            yaml.safe_dump(yaml_dict, sample_file,
-                           sort_keys=False, default_flow_style=False)
+        self._get_store(path).reset_statuses(sample_name)
 
     def map_points(self, snake_like=True, top_left=None, top_right=None,
                    bottom_right=None, bottom_left=None, m_rows=None,
@@ -883,43 +1213,43 @@ class XYGridStage():
         Returns
         -------
         xx, yy : tuple
-            Tuple of two lists with all mapped points for x and y positions in
-            the grid.
-        """
-        top_left = top_left or self.get_presets()[0]
-        top_right = top_right or self.get_presets()[1]
-        bottom_right = bottom_right or self.get_presets()[2]
-        bottom_left = bottom_left or self.get_presets()[3]
-
-        if any(v is None for v in [top_left, top_right, bottom_right,
-                                   bottom_left]):
-            raise ValueError('Could not get presets, make sure you set presets'
-                             ' first using the `set_presets` method.')
+            Tuple of two flat arrays with all mapped points for x and y
+            positions in the grid.
+        """
+        given = (top_left, top_right, bottom_right, bottom_left)
+        if all(given):
+            corners = GridCorners(*given)
+        else:
+            corners = self.get_corners()
+            if corners is None:
+                raise ValueError('Could not get presets, make sure you set'
+                                 ' presets first using the `set_presets`'
+                                 ' method.')
+            if any(given):
+                corners = GridCorners(*(corner or preset for corner, preset
+                                        in zip(given, corners.corners)))
         rows = m_rows or self.m_n_points[0]
         columns = n_columns or self.m_n_points[1]
 
-        a_coeffs, b_coeffs = mesh_interpolation(top_left, top_right,
-                                                bottom_right, bottom_left)
-        self.coefficients = a_coeffs.tolist() + b_coeffs.tolist()
-        x_points, y_points = [], []
+        a_coeffs, b_coeffs = corners.a_coeffs, corners.b_coeffs
+        self.coefficients = corners.coefficients
 
         xx, yy = get_unit_meshgrid(m_rows=rows, n_columns=columns)
-
-        # return x_points, y_points
-        for rowx, rowy in zip(xx, yy):
-            for x, y in zip(rowx, rowy):
-                i, j = convert_to_physical(a_coeffs=a_coeffs,
-                                           b_coeffs=b_coeffs,
-                                           logic_x=x, logic_y=y)
-                x_points.append(i)
-                y_points.append(j)
+        # Whole grid at once, same arithmetic as point by point
+        x_points, y_points = convert_to_physical(a_coeffs=a_coeffs,
+                                                 b_coeffs=b_coeffs,
+                                                 logic_x=xx, logic_y=yy)
         if snake_like:
-            x_points = snake_grid_list(
-                np.array(x_points).reshape(rows, columns))
-            y_points = snake_grid_list(
-                np.array(y_points).reshape(rows, columns))
+            x_points = snake_grid_array(x_points)
+            y_points = snake_grid_array(y_points)
+        else:
+            x_points = x_points.ravel()
+            y_points = y_points.ravel()
         self.positions_x = x_points
         self.positions_y = y_points
+        # After the setters, which forget any previous mapping
+        self._snake_like = snake_like
+        self._mapped_shape = (rows, columns)
         return x_points, y_points
 
     def compute_mapped_point(self, sample_name, m_row, n_column,
@@ -948,7 +1278,8 @@ class XYGridStage():
         -------
         x, y : tuple
             The x, y position for m n location.
-            Or, all the xx, yy values if `compute_all` is `True`.
+            Or, flat arrays of all the xx, yy values if `compute_all` is
+            `True`.
         """
         # TODO: do not check the m and n if compute_all=True
         path = path or self._path
@@ -959,34 +1290,30 @@ class XYGridStage():
             raise ValueError('Some values are empty, please check the sample '
                              f'{sample_name} in the yaml file.')
 
-        if (m_row > m_points) and (n_column > n_points):
+        if m_row == 0 or n_column == 0:
+            raise IndexError('Please start at 1, 1, as the initial points.')
+        if not (0 < m_row <= m_points and 0 < n_column <= n_points):
             raise IndexError('Index out of range, make sure the m and n values'
                              f' are between ({m_points, n_points})')
-        if (m_row or n_column) == 0:
-            raise IndexError('Please start at 1, 1, as the initial points.')
-
-        xx_origin, yy_origin = get_unit_meshgrid(m_rows=m_points,
-                                                 n_columns=n_points)
 
         a_coeffs = coeffs[:4]
         b_coeffs = coeffs[4:]
 
         if not compute_all:
-            logic_x = xx_origin[m_row - 1][n_column - 1]
-            logic_y = yy_origin[m_row - 1][n_column - 1]
+            # Same values as get_unit_meshgrid, without building the grid
+            logic_x = (n_column - 1) * (1 / (n_points - 1))
+            logic_y = (m_row - 1) * (1 / (m_points - 1))
             x, y = convert_to_physical(a_coeffs, b_coeffs, logic_x, logic_y)
             return x, y
 
         # compute all points
-        x_points, y_points = [], []
-        for rowx, rowy in zip(xx_origin, yy_origin):
-            for x, y in zip(rowx, rowy):
-                i, j = convert_to_physical(a_coeffs=a_coeffs,
-                                           b_coeffs=b_coeffs,
-                                           logic_x=x, logic_y=y)
-                x_points.append(i)
-                y_points.append(j)
-        return x_points, y_points
+        xx_origin, yy_origin = get_unit_meshgrid(m_rows=m_points,
+                                                 n_columns=n_points)
+        x_points, y_points = convert_to_physical(a_coeffs=a_coeffs,
+                                                 b_coeffs=b_coeffs,
+                                                 logic_x=xx_origin,
+                                                 logic_y=yy_origin)
+        return x_points.ravel(), y_points.ravel()
 
     def is_target_shot(self, sample, m, n, path=None):
         """
@@ -1007,22 +1334,212 @@ class XYGridStage():
         Returns
         -------
         is_shot : bool
-            Indicates is target is shot or not.
+            Indicates is target is shot or not, `None` if the sample has no
+            saved targets.
         """
-        path = path or self._path
-        x, y = self.compute_mapped_point(sample_name=sample, m_row=m,
-                                         n_column=n, compute_all=False,
-                                         path=path)
-
-        data = self.get_sample_data(sample)
-        xx = data.get('xx')
-        x_status = None
-        # one value should be enough
-        # TODO: this is assuming that none of the points will be the unique.
-        if xx is not None:
-            x_status = next((item['status']
-                             for item in xx if item['pos'] == x), None)
-        return x_status
+        store = self._get_store(path)
+        statuses = store.get_statuses(str(sample))
+        if not len(statuses):
+            return None
+        info = store.get_info(str(sample))
+        return bool(statuses[target_index(info, m, n)])
+
+    def mark_shot(self, sample, m, n, shot=True, path=None):
+        """
+        Mark targets as shot, or not shot.
+
+        Parameters
+        ----------
+        sample : str
+            The name of the sample.
+        m : int or array of int
+            The row or rows of the targets, starting at 1.
+        n : int or array of int
+            The column or columns of the targets, starting at 1.
+        shot : bool, optional
+            The status to set, defaults to `True`.
+        path : str, optional
+            Sample path.
+        """
+        store = self._get_store(path)
+        info = store.get_info(str(sample))
+        store.set_statuses(str(sample), target_index(info, m, n), shot)
+
+    def next_unshot_target(self, sample, path=None):
+        """
+        Find the next target that has not been shot yet.
+
+        Targets are checked in the saved order, snake-like by default.
+
+        Parameters
+        ----------
+        sample : str
+            The name of the sample.
+        path : str, optional
+            Sample path.
+
+        Returns
+        -------
+        m, n : tuple
+            The row and column of the target, or `None` if all the targets
+            are shot.
+        """
+        store = self._get_store(path)
+        statuses = store.get_statuses(str(sample))
+        if not len(statuses):
+            return None
+        index = int(np.argmin(statuses))
+        if statuses[index]:
+            return None
+        return target_from_index(store.get_info(str(sample)), index)
+
+    def count_remaining_targets(self, sample, path=None):
+        """
+        Count the targets of a sample that have not been shot yet.
+
+        Parameters
+        ----------
+        sample : str
+            The name of the sample.
+        path : str, optional
+            Sample path.
+        """
+        statuses = self._get_store(path).get_statuses(str(sample))
+        return len(statuses) - int(np.count_nonzero(statuses))
+
+    def iter_targets(self, sample, skip_shot=True, path=None):
+        """
+        Go through the targets of a saved sample in the saved order.
+
+        The whole path is worked out from the saved positions and statuses
+        before the first target is returned, so each step only reads from
+        arrays. Statuses changed while iterating are not seen.
+
+        Parameters
+        ----------
+        sample : str
+            The name of the sample.
+        skip_shot : bool, optional
+            Leave out the targets that are already shot, defaults to `True`.
+        path : str, optional
+            Sample path.
+
+        Yields
+        ------
+        target : Target
+            The ``index`` of the target in the saved arrays, its ``m`` row,
+            ``n`` column, and ``x`` and ``y`` positions.
+        """
+        sample = str(sample)
+        store = self._get_store(path)
+        info = store.get_info(sample)
+        if info is None:
+            raise ValueError('Could not find this sample name in the store:'
+                             f' {sample}')
+        xx, yy = store.get_positions(sample)
+        if skip_shot:
+            indices = np.flatnonzero(~store.get_statuses(sample))
+        else:
+            indices = np.arange(len(xx))
+        rows, columns = target_from_index(info, indices)
+        for target in zip(indices.tolist(), rows.tolist(), columns.tolist(),
+                          xx[indices].tolist(), yy[indices].tolist()):
+            yield Target(*target)
+
+    def shoot_targets(self, sample, shoot=None, skip_shot=True, timeout=None,
+                      path=None):
+        """
+        Move to each target of a sample in turn and mark it as shot.
+
+        The x and y motors are moved to each target together. Once both are
+        there, ``shoot`` is called with the `Target`, then the target is
+        marked as shot in the sample store. Progress is saved after every
+        target, so if a run stops part way, calling this again with
+        ``skip_shot=True`` carries on with the first target not shot. If a
+        move is interrupted or times out, both motors are stopped.
+
+        Parameters
+        ----------
+        sample : str
+            The name of the sample.
+        shoot : callable, optional
+            Called with each `Target` once the motors are in position.
+        skip_shot : bool, optional
+            Leave out the targets that are already shot, defaults to `True`.
+        timeout : float, optional
+            Maximum time to wait for each move.
+        path : str, optional
+            Sample path.
+
+        Returns
+        -------
+        count : int
+            The number of targets shot.
+        """
+        sample = str(sample)
+        store = self._get_store(path)
+        count = 0
+        for target in self.iter_targets(sample, skip_shot=skip_shot,
+                                        path=path):
+            try:
+                status = self.x.set(target.x) & self.y.set(target.y)
+                status_wait(status, timeout=timeout)
+            except BaseException:
+                # Don't leave the motors moving, e.g. on ctrl+c or timeout
+                self.x.stop()
+                self.y.stop()
+                raise
+            if shoot is not None:
+                shoot(target)
+            store.set_statuses(sample, target.index, True)
+            count += 1
+        return count
+
+    def target_plan(self, sample, detectors=None, skip_shot=True, md=None,
+                    path=None):
+        """
+        Bluesky plan that moves to each target of a sample and reads.
+
+        This is the plan version of `shoot_targets`: x and y move together
+        to each target, then the ``detectors`` and both motors are
+        triggered and read as one event, and the target is marked as shot.
+
+        Parameters
+        ----------
+        sample : str
+            The name of the sample.
+        detectors : list, optional
+            Readable devices to trigger and read at each target.
+        skip_shot : bool, optional
+            Leave out the targets that are already shot, defaults to `True`.
+        md : dict, optional
+            Metadata for the run.
+        path : str, optional
+            Sample path.
+
+        Examples
+        --------
+        >>> RE(xy.target_plan('sample1', [det]))
+        """
+        sample = str(sample)
+        store = self._get_store(path)
+        detectors = list(detectors or [])
+        targets = self.iter_targets(sample, skip_shot=skip_shot, path=path)
+        _md = {'detectors': [det.name for det in detectors],
+               'motors': [self.x.name, self.y.name],
+               'plan_name': 'target_plan',
+               'sample': sample}
+        _md.update(md or {})
+
+        @bpp.stage_decorator(detectors + [self.x, self.y])
+        @bpp.run_decorator(md=_md)
+        def inner_target_plan():
+            for target in targets:
+                yield from bps.mv(self.x, target.x, self.y, target.y)
+                yield from bps.trigger_and_read(detectors + [self.x, self.y])
+                store.set_statuses(sample, target.index, True)
+
+        return (yield from inner_target_plan())
 
     def move_to_sample(self, m, n):
         """
@@ -1067,6 +1584,57 @@ class XYGridStage():
         self.y.mv(m)
 
 
+def target_index(info, m, n):
+    """
+    Get the position of target (m, n) in a saved sample's target arrays.
+
+    Parameters
+    ----------
+    info : dict
+        The saved information for the sample, with ``M``, ``N`` and
+        optionally ``snake_like``, which defaults to `True`.
+    m : int or array of int
+        The row or rows of the targets, starting at 1.
+    n : int or array of int
+        The column or columns of the targets, starting at 1.
+
+    Returns
+    -------
+    index : int or np.ndarray
+        The index or indices into the target arrays.
+    """
+    m_points, n_points = info['M'], info['N']
+    row = np.asarray(m) - 1
+    column = np.asarray(n) - 1
+    if (np.any(row < 0) or np.any(row >= m_points)
+            or np.any(column < 0) or np.any(column >= n_points)):
+        raise IndexError('Index out of range, make sure the m and n values'
+                         f' are between (1, 1) and ({m_points, n_points})')
+    if info.get('snake_like', True):
+        # Odd rows are saved in reverse
+        column = np.where(row % 2, n_points - 1 - column, column)
+    index = row * n_points + column
+    if index.ndim == 0:
+        return int(index)
+    return index
+
+
+def target_from_index(info, index):
+    """
+    Get the (m, n) target at a position in a saved sample's target arrays.
+
+    This is the inverse of `target_index`, and also works on an array of
+    indices.
+    """
+    n_points = info['N']
+    row, column = np.divmod(index, n_points)
+    if info.get('snake_like', True):
+        column = np.where(row % 2, n_points - 1 - column, column)
+    if np.ndim(row) == 0:
+        return int(row) + 1, int(column) + 1
+    return row + 1, column + 1
+
+
 def mesh_interpolation(top_left, top_right, bottom_right, bottom_left):
     """
     Mapping functions for an arbitrary quadrilateral.
@@ -1163,8 +1731,8 @@ def get_unit_meshgrid(m_rows, n_columns):
     dx = lx / (ni - 1)
     dy = ly / (nj - 1)
 
-    xx = [x0 + (i - 1) * dx for i in range(1, ni + 1)]
-    yy = [y0 + (j - 1) * dy for j in range(1, nj + 1)]
+    xx = x0 + np.arange(ni) * dx
+    yy = y0 + np.arange(nj) * dy
 
     return np.meshgrid(xx, yy)
 
@@ -1213,16 +1781,26 @@ def snake_grid_list(points):
     flat_points : list
         List of all the grid points folowing a snake-like pattern.
     """
-    temp_points = []
-    for i in range(points.shape[0]):
-        if i % 2 == 0:
-            temp_points.append(points[i])
-        else:
-            t = points[i]
-            tt = t[::-1]
-            temp_points.append(tt)
-    flat_points = list(chain.from_iterable(temp_points))
     # convert the numpy.float64 to normal float to be able to easily
     # save them in the yaml file
-    flat_points = [float(v) for v in flat_points]
-    return flat_points
+    return snake_grid_array(points).astype(float).tolist()
+
+
+def snake_grid_array(points):
+    """
+    Flatten an MxN array into a snake_like pattern, reversing every odd row.
+    [[1, 2], [3, 4]] => array([1, 2, 4, 3])
+
+    Parameters
+    ----------
+    points : array
+        Array containing the grid points for an axis with shape MxN.
+
+    Returns
+    -------
+    flat_points : np.ndarray
+        Flat array of all the grid points following a snake-like pattern.
+    """
+    flat_points = np.array(points)
+    flat_points[1::2] = flat_points[1::2, ::-1]
+    return flat_points.ravel()
@@ -1,3 +1,7 @@
+import heapq
+import itertools
+import logging
+import math
 import operator
 import os
 import select
@@ -5,8 +9,10 @@ import shutil
 import sys
 import threading
 import time
-from functools import reduce
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, reduce
 
+import numpy as np
 import ophyd
 import pint
 import prettytable
@@ -18,6 +24,7 @@ except ImportError:
     tty = None
     termios = None
 
+logger = logging.getLogger(__name__)
 
 arrow_up = '\x1b[A'
 arrow_down = '\x1b[B'
@@ -91,17 +98,211 @@ def get_input():
         return inp
 
 
+class KeyReader:
+    """
+    Streaming reader for key presses from `sys.stdin`.
+
+    Use this as a context manager. The terminal stays in cbreak mode for the
+    whole block, so keys can be read as they arrive with :meth:`read`
+    without swapping terminal modes for every key. The keys are the same
+    strings as the ones returned by :func:`get_input`.
+    """
+
+    def __init__(self):
+        if termios is None:
+            raise RuntimeError('Not supported on this platform')
+        self._file = None
+        self._old_settings = None
+        self._buffer = ''
+
+    def __enter__(self):
+        self._file = sys.stdin
+        self._old_settings = termios.tcgetattr(self._file)
+        tty.setcbreak(self._file.fileno())
+        return self
+
+    def __exit__(self, *exc):
+        termios.tcsetattr(self._file, termios.TCSADRAIN, self._old_settings)
+
+    def read(self, timeout=None):
+        """
+        Get all of the key presses that are available.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            How long to wait for the first key press. If omitted, wait
+            forever.
+
+        Returns
+        -------
+        keys : list of str
+            The keys in the order they were pressed. This is empty if no key
+            was pressed before the timeout.
+        """
+        fd = self._file.fileno()
+        ready, _, _ = select.select([fd], [], [], timeout)
+        if not ready:
+            return []
+        self._buffer += os.read(fd, 1024).decode(errors='ignore')
+        keys, self._buffer = _split_keys(self._buffer)
+        if self._buffer:
+            # Give the rest of a control sequence a moment to arrive
+            if select.select([fd], [], [], 0.01)[0]:
+                self._buffer += os.read(fd, 1024).decode(errors='ignore')
+            more, self._buffer = _split_keys(self._buffer, partial=True)
+            keys.extend(more)
+        return keys
+
+
+def _split_keys(text, partial=False):
+    """
+    Split raw terminal input into keys.
+
+    Returns the keys and any incomplete control sequence left at the end.
+    If ``partial`` is set, the incomplete sequence is returned as a key.
+    """
+    keys = []
+    i = 0
+    while i < len(text):
+        size = 1
+        if text[i] == '\x1b':
+            # Control sequence, with more for shift/alt/ctrl modifiers
+            size = 6 if text[i + 1:i + 3] == '[1' else 3
+            if i + size > len(text) and not partial:
+                break
+        keys.append(text[i:i + size])
+        i += size
+    return keys, text[i:]
+
+
 ureg = None
+_ureg_lock = threading.Lock()
+_ureg_ready = threading.Event()
+_ureg_thread = None
+
+# 'lazy' builds the pint registry on the first unit conversion, 'background'
+# starts building it in a thread when pcdsdevices is imported
+_unit_registry_modes = ('lazy', 'background')
+
+
+def _get_unit_registry_mode(mode):
+    """Validate a PCDSDEVICES_UNIT_REGISTRY value, defaulting to lazy."""
+    if not mode:
+        return 'lazy'
+    if mode not in _unit_registry_modes:
+        logger.warning('Unknown PCDSDEVICES_UNIT_REGISTRY value %r, expected '
+                       'one of %s. Building the unit registry lazily.',
+                       mode, ', '.join(_unit_registry_modes))
+        return 'lazy'
+    return mode
+
+
+unit_registry_mode = _get_unit_registry_mode(
+    os.environ.get('PCDSDEVICES_UNIT_REGISTRY'))
+# Folder for pint's parsed definition cache, e.g. ':auto:'. Off by default.
+unit_registry_cache = os.environ.get('PCDSDEVICES_UNIT_CACHE') or None
+
+
+def get_unit_registry():
+    """
+    Return the shared pint ``UnitRegistry``, creating it if needed.
+
+    If the registry is being built in the background, this waits for it.
+    """
+    global ureg
+    if ureg is None:
+        with _ureg_lock:
+            if ureg is None:
+                ureg = _make_unit_registry()
+                _ureg_ready.set()
+    return ureg
+
+
+def _make_unit_registry():
+    if unit_registry_cache is not None:
+        try:
+            return pint.UnitRegistry(cache_folder=unit_registry_cache)
+        except Exception:
+            logger.debug('Could not use pint cache folder %s',
+                         unit_registry_cache, exc_info=True)
+    return pint.UnitRegistry()
+
+
+def _reset_unit_registry_after_fork():
+    """
+    Give a forked child its own registry lock.
+
+    The thread building the registry doesn't exist in the child, so a lock
+    it held at fork time would never be released.
+    """
+    global _ureg_lock, _ureg_ready, _ureg_thread
+    _ureg_lock = threading.Lock()
+    if ureg is None:
+        _ureg_ready = threading.Event()
+        _ureg_thread = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_unit_registry_after_fork)
+
+
+def preload_unit_registry():
+    """
+    Start building the shared pint ``UnitRegistry`` in a background thread.
+
+    Does nothing if the registry exists or is already being built.
+
+    Returns
+    -------
+    thread : threading.Thread or None
+        The thread building the registry, if one was started.
+    """
+    global _ureg_thread
+    if ureg is None and _ureg_thread is None:
+        _ureg_thread = threading.Thread(target=get_unit_registry,
+                                        name='pcdsdevices_unit_registry',
+                                        daemon=True)
+        _ureg_thread.start()
+    return _ureg_thread
+
+
+def wait_for_unit_registry(timeout=None):
+    """
+    Wait for the shared pint ``UnitRegistry`` to be ready.
+
+    Starts building it in the background if that hasn't happened yet.
+
+    Parameters
+    ----------
+    timeout : float, optional
+        Maximum time to wait in seconds. Waits forever by default.
+
+    Returns
+    -------
+    ready : bool
+        `True` if the registry is ready.
+    """
+    if ureg is None:
+        preload_unit_registry()
+    return _ureg_ready.wait(timeout)
 
 
 def convert_unit(value, unit, new_unit):
     """
     One-line unit conversion.
 
+    Linear and affine conversions, which covers most units, are only worked
+    out with pint once, then cached as a plain scale and offset. Anything
+    else, such as logarithmic units, goes through pint every time. Either
+    way the result is the same as pint's, including keeping integers as
+    integers when the units do not change.
+
     Parameters
     ----------
-    value : float
-        The starting value for the conversion.
+    value : float or np.ndarray
+        The starting value for the conversion. Arrays, lists and tuples are
+        converted element-wise.
 
     unit : str
         The starting unit for the conversion.
@@ -111,16 +312,46 @@ def convert_unit(value, unit, new_unit):
 
     Returns
     -------
-    new_value : float
+    new_value : float or np.ndarray
         The starting value, but converted to the new unit.
     """
+    factors = _conversion_factors(unit, new_unit)
+    if factors is None:
+        expr = get_unit_registry().parse_expression(unit)
+        return (value * expr).to(new_unit).magnitude
+    scale, offset = factors
+    if isinstance(value, (list, tuple)):
+        value = np.asarray(value)
+    if offset:
+        return value * scale + offset
+    return value * scale
+
+
+@lru_cache(maxsize=None)
+def _conversion_factors(unit, new_unit):
+    """
+    Return (scale, offset) such that new = scale * value + offset.
 
-    global ureg
-    if ureg is None:
-        ureg = pint.UnitRegistry()
-
-    expr = ureg.parse_expression(unit)
-    return (value * expr).to(new_unit).magnitude
+    This is ``(1, 0)`` if pint leaves the value as is, and `None` if the
+    conversion is not affine or pint can't work it out for plain numbers.
+    """
+    expr = get_unit_registry().parse_expression(unit)
+    try:
+        zero, one, two = ((num * expr).to(new_unit).magnitude
+                          for num in (0, 1, 2))
+    except Exception:
+        logger.debug('No cached conversion from %s to %s', unit, new_unit,
+                     exc_info=True)
+        return None
+    if isinstance(one, int):
+        # Same units, pint keeps the value and its type
+        return 1, 0
+    offset = float(zero)
+    scale = float(one) - offset
+    if not math.isclose(float(two), 2 * scale + offset, rel_tol=1e-9,
+                        abs_tol=1e-300):
+        return None
+    return scale, offset
 
 
 def ipm_screen(dettype, prefix, prefix_ioc):
@@ -172,7 +403,65 @@ def get_component(obj):
     return getattr(type(obj.parent), obj.attr_name, None)
 
 
-def schedule_task(func, args=None, kwargs=None, delay=None):
+class _DelayedTaskScheduler:
+    """
+    Run callables after a delay from one shared background thread.
+
+    Tasks are kept in a heap ordered by due time. Tasks scheduled with a
+    ``key`` are merged: while a task with the same key is pending, scheduling
+    again only replaces the callable, keeping the earlier due time.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._pending = {}
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def schedule(self, delay, func, key=None):
+        with self._cond:
+            if key is not None and key in self._pending:
+                self._pending[key][3] = func
+                return
+            entry = [time.monotonic() + delay, next(self._counter), key, func]
+            heapq.heappush(self._heap, entry)
+            if key is not None:
+                self._pending[key] = entry
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='pcdsdevices_delayed_tasks',
+                    daemon=True,
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                when, _, key, func = self._heap[0]
+                remaining = when - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                heapq.heappop(self._heap)
+                if key is not None:
+                    del self._pending[key]
+            try:
+                func()
+            except Exception:
+                logger.exception('Error in delayed task %s', func)
+
+    def __len__(self):
+        return len(self._heap)
+
+
+_delayed_tasks = _DelayedTaskScheduler()
+
+
+def schedule_task(func, args=None, kwargs=None, delay=None, key=None):
     """
     Use ophyd's dispatcher to schedule a task for later.
 
@@ -180,6 +469,10 @@ def schedule_task(func, args=None, kwargs=None, delay=None):
     Schedules a task for the utility thread if we're in some arbitrary thread,
     schedules a task for the same thread if we're in one of ophyd's callback
     queues already.
+
+    Delayed tasks all wait in one shared scheduler thread. If ``key`` is
+    given, a delayed task with the same key that is still waiting is replaced
+    by this one instead of running twice, keeping the earlier due time.
     """
     if args is None:
         args = ()
@@ -189,7 +482,7 @@ def schedule_task(func, args=None, kwargs=None, delay=None):
     dispatcher = ophyd.cl.get_dispatcher()
 
     # Check if we're already in an ophyd dispatcher thread
-    current_thread = threading.currentThread()
+    current_thread = threading.current_thread()
     matched_thread = None
     for name, thread in dispatcher.threads.items():
         if thread == current_thread:
@@ -211,8 +504,54 @@ def schedule_task(func, args=None, kwargs=None, delay=None):
         schedule()
     else:
         # Do it later
-        timer = threading.Timer(delay, schedule)
-        timer.start()
+        _delayed_tasks.schedule(delay, schedule, key=key)
+
+
+_thread_pools = {}
+_thread_pools_lock = threading.Lock()
+_pool_thread = threading.local()
+
+
+def get_thread_pool(name, max_workers):
+    """
+    Get a shared thread pool, creating it on first use.
+
+    Parameters
+    ----------
+    name : str
+        Identifies the pool, and prefixes the names of its threads.
+
+    max_workers : int
+        The number of threads, used only when the pool is created.
+
+    Returns
+    -------
+    pool : concurrent.futures.ThreadPoolExecutor
+    """
+    with _thread_pools_lock:
+        try:
+            return _thread_pools[name]
+        except KeyError:
+            pool = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=name,
+                initializer=_init_pool_thread, initargs=(name,),
+            )
+            _thread_pools[name] = pool
+            return pool
+
+
+def _init_pool_thread(name):
+    _pool_thread.name = name
+
+
+def in_thread_pool(name):
+    """
+    Check if the current thread belongs to the shared pool called ``name``.
+
+    Work that is already running in a pool should not wait on more work
+    submitted to the same pool, as all of its threads may be waiting.
+    """
+    return getattr(_pool_thread, 'name', None) == name
 
 
 def get_status_value(status_info, *keys, default_value='N/A'):
@@ -2,10 +2,13 @@ import logging
 from unittest.mock import Mock
 
 import pytest
+from ophyd import Component as Cpt
+from ophyd import Device
 from ophyd.sim import make_fake_device
 
 from pcdsdevices.inout import (InOutPositioner, InOutPVStatePositioner,
                                InOutRecordPositioner, TwinCATInOutPositioner)
+from pcdsdevices.interface import BaseInterface, LightpathInOutMixin
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +73,27 @@ def test_subcls_warning():
         InOutPVStatePositioner('prefix', name='name')
 
 
+def test_inout_shared_states():
+    logger.debug('test_inout_shared_states')
+    Fake = make_fake_device(InOutRecordPositioner)
+    devices = []
+    for num in range(3):
+        inout = Fake('Test:Ref{}'.format(num), name='test{}'.format(num))
+        inout.state.sim_put(0)
+        inout.state.sim_set_enum_strs(('Unknown', 'IN', 'OUT'))
+        inout.get_state('IN')
+        devices.append(inout)
+    first = devices[0]
+    for inout in devices[1:]:
+        assert inout.states_enum is first.states_enum
+        assert inout._valid_states is first._valid_states
+        assert inout._trans_enum is first._trans_enum
+        # The class aliases are left alone
+        assert inout._states_alias == first._states_alias
+    assert InOutRecordPositioner._states_alias == {}
+    assert first.check_transmission('OUT') == 1
+
+
 @pytest.fixture(scope='function')
 def fake_tcinout():
     FakeCls = make_fake_device(TwinCATInOutPositioner)
@@ -90,3 +114,47 @@ def test_in_if_not_out(fake_tcinout):
     fake_tcinout.state.sim_put(2)
     assert fake_tcinout.inserted
     assert not fake_tcinout.removed
+
+
+class TwoTargets(BaseInterface, Device, LightpathInOutMixin):
+    lightpath_cpts = ['one', 'two']
+    one = Cpt(InOutRecordPositioner, ':ONE')
+    two = Cpt(InOutRecordPositioner, ':TWO')
+
+
+def test_lightpath_incremental():
+    logger.debug('test_lightpath_incremental')
+    FakeTargets = make_fake_device(TwoTargets)
+    targets = FakeTargets('Test:Targets', name='targets')
+    for inout in (targets.one, targets.two):
+        inout.state.sim_set_enum_strs(('Unknown', 'IN', 'OUT'))
+        inout.state.sim_put('OUT')
+    assert targets.removed
+    assert targets.transmission == 1
+
+    cb = Mock()
+    targets.subscribe(cb, event_type=targets.SUB_STATE, run=False)
+    targets.two.check_inserted = Mock(wraps=targets.two.check_inserted)
+    targets.one.state.sim_put('IN')
+    assert targets.inserted
+    assert targets.transmission == 0
+    assert cb.call_count == 1
+    # Only the component that changed is checked again
+    assert not targets.two.check_inserted.called
+    assert not targets._lightpath_changed
+    # So an unchanged component can't hold up the update
+    targets.two._state_initialized = False
+    targets.one.state.sim_put('OUT')
+    assert targets.removed
+    assert cb.call_count == 2
+    targets.two._state_initialized = True
+    targets.one.state.sim_put('IN')
+    assert cb.call_count == 3
+
+    # Same summary, no new lightpath update
+    targets.two.state.sim_put('IN')
+    assert cb.call_count == 3
+    targets.one.state.sim_put('OUT')
+    targets.two.state.sim_put('OUT')
+    assert targets.removed
+    assert cb.call_count == 4
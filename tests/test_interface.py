@@ -1,18 +1,28 @@
 import fcntl
+import json
 import logging
 import multiprocessing as mp
 import os
+import pty
 import signal
+import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 import conftest
 import ophyd
 import pytest
+from ophyd.status import Status
 
-from pcdsdevices.interface import (BaseInterface, TabCompletionHelperClass,
+from pcdsdevices import utils
+from pcdsdevices.interface import (AbsProgressBar, BaseInterface,
+                                   JsonlPresetBackend,
+                                   TabCompletionHelperClass, camonitor,
                                    get_engineering_mode, set_engineering_mode,
-                                   setup_preset_paths)
+                                   setup_preset_paths, tweak_base, umv_many,
+                                   umvr_many)
 from pcdsdevices.sim import FastMotor, SlowMotor
 
 logger = logging.getLogger(__name__)
@@ -46,6 +56,66 @@ def test_umv(slow_motor):
     assert slow_motor.position == start_position + delta
 
 
+@pytest.mark.timeout(5)
+def test_umv_many(slow_motor):
+    logger.debug('test_umv_many')
+    other = SlowMotor(name='sim_slow_other')
+    start = time.monotonic()
+    umv_many({slow_motor: 5, other: -5})
+    assert time.monotonic() - start < 1
+    assert slow_motor.position == 5
+    assert other.position == -5
+    umvr_many({slow_motor: -2, other: 2})
+    assert slow_motor.position == 3
+    assert other.position == -3
+
+
+def test_umv_many_limits(fast_motor, caplog):
+    logger.debug('test_umv_many_limits')
+    other = FastMotor(name='sim_other')
+    other._limits = (-1, 1)
+    with pytest.raises(ValueError):
+        umv_many({})
+    with pytest.raises(ValueError):
+        umvr_many({})
+    fast_motor.mv(0, wait=True)
+    caplog.clear()
+    with caplog.at_level(logging.INFO):
+        umv_many({fast_motor: 1, other: 5})
+    # Nothing moved and nothing was logged as started
+    assert fast_motor.wm() == 0
+    assert 'Moving' not in caplog.text
+    assert 'Failed to move sim_other' in caplog.text
+
+
+@pytest.mark.timeout(5)
+def test_umv_many_fail(slow_motor, monkeypatch):
+    logger.debug('test_umv_many_fail')
+    other = SlowMotor(name='sim_slow_other')
+    finished = []
+    no_more_updates = AbsProgressBar.no_more_updates
+
+    def record_no_more_updates(self):
+        finished.append(self)
+        no_more_updates(self)
+
+    def fail_move(position, timeout=None, wait=False):
+        status = Status()
+        status.set_exception(RuntimeError('Move failed'))
+        return status
+
+    monkeypatch.setattr(AbsProgressBar, 'no_more_updates',
+                        record_no_more_updates)
+    monkeypatch.setattr(other, 'move', fail_move)
+    # Combined statuses report the failure as a generic ophyd error
+    with pytest.raises(Exception):
+        umv_many({slow_motor: 100, other: -100})
+    # The axis that was still moving is stopped and the display is done
+    assert slow_motor._stop
+    assert slow_motor.position != 100
+    assert finished
+
+
 def test_camonitor(fast_motor):
     logger.debug('test_camonitor')
     pid = os.getpid()
@@ -58,6 +128,88 @@ def test_camonitor(fast_motor):
     fast_motor.camonitor()
 
 
+def test_camonitor_multi(capsys, fast_motor):
+    logger.debug('test_camonitor_multi')
+    other = FastMotor(name='sim_other')
+    thread = threading.Thread(target=camonitor, args=(fast_motor, other))
+    thread.start()
+    time.sleep(0.2)
+    fast_motor.mv(3, wait=True)
+    time.sleep(0.2)
+    other.mv(5, wait=True)
+    time.sleep(0.2)
+    other.end_monitor_thread()
+    thread.join(timeout=1)
+    assert not thread.is_alive()
+    out = capsys.readouterr().out
+    assert 'sim_fast: 3.000000, sim_other: 0.000000' in out
+    assert 'sim_fast: 3.000000, sim_other: 5.000000' in out
+    # Subscriptions are cleaned up
+    assert not fast_motor._callbacks[fast_motor.SUB_READBACK]
+
+
+@pytest.mark.timeout(5)
+def test_camonitor_empty():
+    logger.debug('test_camonitor_empty')
+    with pytest.raises(ValueError):
+        camonitor()
+
+
+@pytest.fixture(scope='function')
+def sim_input(monkeypatch):
+    master, slave = pty.openpty()
+    with open(slave, 'r') as fake_stdin:
+        with open(master, 'w') as sim_input:
+            monkeypatch.setattr(sys, 'stdin', fake_stdin)
+            yield sim_input
+
+
+@pytest.mark.timeout(5)
+def test_tweak_three_axes(sim_input):
+    logger.debug('test_tweak_three_axes')
+    motors = [FastMotor(name=f'sim_tweak{i}') for i in range(3)]
+    keys = [utils.arrow_right, utils.arrow_right, utils.arrow_up,
+            utils.plus, utils.alt_arrow_left, 'q']
+
+    def press():
+        for key in keys:
+            time.sleep(0.05)
+            sim_input.write(key)
+            sim_input.flush()
+
+    threading.Thread(target=press).start()
+    tweak_base(*motors)
+    assert motors[0].position == pytest.approx(0.2)
+    assert motors[1].position == pytest.approx(0.1)
+    assert motors[2].position == pytest.approx(-0.2)
+
+
+@pytest.mark.timeout(5)
+def test_tweak_merges_keys(sim_input, slow_motor):
+    logger.debug('test_tweak_merges_keys')
+
+    def press():
+        time.sleep(0.1)
+        sim_input.write(utils.arrow_right * 5 + utils.arrow_left * 2)
+        sim_input.flush()
+        time.sleep(0.3)
+        sim_input.write('q')
+        sim_input.flush()
+
+    threading.Thread(target=press).start()
+    moves = []
+    real_move = slow_motor.move
+
+    def move(position, *args, **kwargs):
+        moves.append(position)
+        return real_move(position, *args, **kwargs)
+
+    slow_motor.move = move
+    tweak_base(slow_motor)
+    assert moves == [pytest.approx(0.3)]
+    assert slow_motor.position == pytest.approx(0.3)
+
+
 def test_mv_ginput(monkeypatch, fast_motor):
     logger.debug('test_mv_ginput')
     # Importing forces backend selection, so do inside method
@@ -168,6 +320,160 @@ def test_presets(presets, fast_motor):
     assert hasattr(fast_motor, 'mv_sample')
 
 
+def test_presets_same_size_rewrite(presets, fast_motor):
+    logger.debug('test_presets_same_size_rewrite')
+    fast_motor.presets.add_hutch('zero', 1)
+    assert fast_motor.wm_zero() == 1
+    # Another session rewrites the file to the same size within one mtime tick
+    path = Path(fast_motor.presets.positions.zero.path)
+    stat = path.stat()
+    text = path.read_text()
+    path.write_text(text.replace('value: 1', 'value: 2'))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert path.stat().st_size == stat.st_size
+    fast_motor.presets.sync()
+    assert fast_motor.wm_zero() == 2
+
+
+@pytest.fixture(scope='function')
+def jsonl_presets(tmp_path):
+    hutch = tmp_path / 'hutch'
+    user = tmp_path / 'user'
+    hutch.mkdir()
+    user.mkdir()
+    setup_preset_paths(backend=JsonlPresetBackend, hutch=hutch, user=user)
+    yield hutch
+    setup_preset_paths()
+
+
+def test_presets_jsonl(jsonl_presets, fast_motor):
+    logger.debug('test_presets_jsonl')
+    other = FastMotor(name='sim_other')
+
+    fast_motor.mv(4, wait=True)
+    fast_motor.presets.add_hutch('four', comment='four!')
+    fast_motor.presets.add_hutch('zero', 0, comment='center')
+    other.presets.add_hutch('one', 1)
+    assert fast_motor.wm_four() == 0
+    assert fast_motor.wm_zero() == -4
+    assert other.wm_one() == 1
+    assert not hasattr(other, 'wm_zero')
+
+    # Every device shares one file, with one line per update
+    path = jsonl_presets / JsonlPresetBackend.filename
+    assert fast_motor.presets.positions.zero.path == str(path)
+    assert other.presets.positions.one.path == str(path)
+    assert len(path.read_text().splitlines()) == 3
+
+    fast_motor.presets.positions.zero.update_pos(2, comment='hats')
+    fast_motor.presets.positions.four.deactivate()
+    assert fast_motor.presets.positions.zero.pos == 2
+    assert not hasattr(fast_motor, 'wm_four')
+    assert len(path.read_text().splitlines()) == 5
+
+    # A fresh load matches the incremental index
+    setup_preset_paths(backend=JsonlPresetBackend, hutch=jsonl_presets)
+    assert fast_motor.wm_zero() == -2
+    assert other.wm_one() == 1
+    assert not hasattr(fast_motor, 'wm_four')
+
+    # Compaction keeps one line per preset position
+    backend = fast_motor.presets._backends['hutch']
+    backend.compact()
+    assert len(path.read_text().splitlines()) == 3
+    fast_motor.presets.sync()
+    assert fast_motor.wm_zero() == -2
+    assert fast_motor.presets.positions.zero.history == backend.read(
+        fast_motor.name)['zero']['history']
+
+
+def test_presets_jsonl_malformed(caplog, tmp_path, fast_motor):
+    logger.debug('test_presets_jsonl_malformed')
+    good = dict(device=fast_motor.name, name='zero', value=0, active=True,
+                history={})
+    lines = [
+        json.dumps(good),
+        'not json',
+        json.dumps(['a', 'list']),
+        json.dumps(dict(good, name='missing_value', value=None)),
+        json.dumps({k: v for k, v in good.items() if k != 'device'}),
+        json.dumps(dict(good, name='bad_value', value='one')),
+        json.dumps(dict(good, name='bad_history', history=[])),
+    ]
+    path = tmp_path / JsonlPresetBackend.filename
+    path.write_text('\n'.join(lines) + '\n')
+    try:
+        with caplog.at_level(logging.WARNING):
+            setup_preset_paths(backend=JsonlPresetBackend, hutch=tmp_path)
+        assert fast_motor.presets.positions.zero.pos == 0
+        assert fast_motor.wm_zero() == 0
+        for name in ('missing_value', 'bad_value', 'bad_history'):
+            assert not hasattr(fast_motor, 'wm_' + name)
+        assert caplog.text.count('Skipping corrupt line') == 6
+    finally:
+        setup_preset_paths()
+
+
+def test_presets_lazy(fast_motor, tmp_path):
+    logger.debug('test_presets_lazy')
+    setup_preset_paths(lazy_methods=True, hutch=tmp_path)
+    try:
+        fast_motor.mv(4, wait=True)
+        fast_motor.presets.add_hutch('four')
+        fast_motor.presets.add_hutch('zero', 0)
+        # Nothing is installed on the device itself
+        assert 'wm_zero' not in fast_motor.__dict__
+        assert fast_motor.wm_zero() == -4
+        assert fast_motor.wm_four() == 0
+        fast_motor.umv_zero()
+        assert fast_motor.wm() == 0
+        assert fast_motor.presets.state() == 'zero'
+        fast_motor.mv_four(wait=True)
+        assert fast_motor.wm() == 4
+
+        # Tab completion still lists the methods
+        set_engineering_mode(False)
+        user_dir = dir(fast_motor)
+        set_engineering_mode(True)
+        for attr in ('mv_zero', 'umv_zero', 'wm_zero'):
+            assert attr in user_dir
+            assert attr in dir(fast_motor)
+
+        fast_motor.presets.positions.zero.deactivate()
+        assert not hasattr(fast_motor, 'wm_zero')
+        assert 'wm_zero' not in dir(fast_motor)
+    finally:
+        setup_preset_paths()
+    assert not hasattr(fast_motor, 'wm_four')
+
+
+def test_presets_threads(presets, fast_motor):
+    logger.debug('test_presets_threads')
+    # File locking used to rely on SIGALRM, which only works on main thread
+    motors = [FastMotor(name=f'sim_thread{i}') for i in range(4)]
+
+    def add(motor):
+        motor.presets.add_hutch('zero', 0)
+        motor.presets.add_hutch('one', 1)
+        return motor.presets.positions.one.pos
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(add, motors)) == [1] * 4
+
+    path = fast_motor.presets._path('hutch')
+    path.touch()
+    with open(path, 'r+') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        thread = threading.Thread(target=fast_motor.presets.add_hutch,
+                                  args=('blocked', 0))
+        start = time.monotonic()
+        thread.start()
+        thread.join()
+        assert time.monotonic() - start >= 1
+        fcntl.flock(f, fcntl.LOCK_UN)
+    assert not hasattr(fast_motor.presets.positions, 'blocked')
+
+
 def test_presets_type(presets, fast_motor):
     logger.debug('test_presets_type')
     # Mess up the input types, fail before opening the file
@@ -320,3 +626,117 @@ def test_tab_helper_class():
     tab.add('foobar')
     tab.reset()
     assert 'foobar' not in tab.get_filtered_dir_list()
+
+
+class SlowSignal(ophyd.Signal):
+    def get(self, **kwargs):
+        time.sleep(0.2)
+        return super().get(**kwargs)
+
+
+def test_status_info_concurrent():
+    logger.debug('test_status_info_concurrent')
+
+    class SlowDevice(BaseInterface, ophyd.Device):
+        a = ophyd.Component(SlowSignal, value=1)
+        b = ophyd.Component(SlowSignal, value=2)
+        c = ophyd.Component(SlowSignal, value=3)
+        d = ophyd.Component(SlowSignal, value=4)
+
+    dev = SlowDevice(name='dev')
+    start = time.monotonic()
+    status_info = dev.status_info()
+    assert time.monotonic() - start < 0.6
+    for value, attr in enumerate('abcd', start=1):
+        assert status_info[attr]['value'] == value
+    assert 'a: 1' in dev.format_status_info(status_info)
+
+
+class CountingSignal(ophyd.Signal):
+    gets = 0
+
+    def get(self, **kwargs):
+        self.gets += 1
+        return super().get(**kwargs)
+
+
+def test_status_cache():
+    logger.debug('test_status_cache')
+
+    class CachedDevice(BaseInterface, ophyd.Device):
+        a = ophyd.Component(CountingSignal, value=1)
+        b = ophyd.Component(CountingSignal, value=2, kind='config')
+
+    dev = CachedDevice(name='dev')
+    dev.enable_status_cache()
+    assert dev.status_info()['a']['value'] == 1
+    assert dev.a.gets == 1
+    # Normal signals come from the cache, others are not shown or read
+    time.sleep(0.01)
+    info = dev.status_info()
+    assert 'b' not in info
+    assert dev.a.gets == 1
+    assert dev.b.gets == 0
+    # Monitor updates go straight into the cache
+    dev.a.put(10)
+    assert dev.status_info()['a']['value'] == 10
+    assert dev.a.gets == 1
+    # With a max_age, old values are read again even if monitored
+    dev._status_cache.max_age = 0
+    time.sleep(0.01)
+    dev.status_info()
+    assert dev.a.gets == 2
+    dev.disable_status_cache()
+    assert not dev.a._callbacks[dev.a.SUB_VALUE]
+    dev.status_info()
+    assert dev.a.gets == 3
+
+
+def test_tab_helper_cache():
+    class MyDevice(BaseInterface, ophyd.Device):
+        tab_whitelist = ['a', 'b', 'c']
+        a = 1
+
+    one = MyDevice(name='one')
+    two = MyDevice(name='two')
+    class_dir = MyDevice._class_tab.get_filtered_class_dir()
+    assert 'a' in class_dir
+    assert MyDevice._class_tab.get_filtered_class_dir() is class_dir
+    assert set(class_dir) < set(one._tab.get_filtered_dir_list())
+    assert one._tab.get_filtered_dir_list() == two._tab.get_filtered_dir_list()
+
+    # New attributes only show up after an invalidation
+    one.b = 2
+    assert 'b' not in one._tab.get_filtered_dir_list()
+    set_engineering_mode(False)
+    assert 'b' in one._tab.get_filtered_dir_list()
+    assert 'b' in dir(one)
+    set_engineering_mode(True)
+    one._tab.get_filtered_dir_list()
+    one.c = 3
+    assert 'c' not in one._tab.get_filtered_dir_list()
+    one._tab.remove('c')
+    one._tab.add('c')
+    assert 'c' in one._tab.get_filtered_dir_list()
+    assert 'c' not in two._tab.get_filtered_dir_list()
+
+
+def test_tab_helper_cache_extra_includes():
+    class MyDevice(BaseInterface, ophyd.Device):
+        tab_whitelist = ['a']
+        a = 1
+        b = 2
+        c = 3
+
+    devices = [MyDevice(name=f'dev{num}') for num in range(5)]
+    for num, dev in enumerate(devices):
+        dev._tab.add(f'extra{num}')
+        dev._tab.add('b')
+        assert dev._tab.get_filtered_dir_list()[:2] == ['a', 'b']
+    # Extra includes don't add class cache entries
+    assert set(MyDevice._class_tab._dir_cache) == {'dir', 'filtered'}
+    # Removing a class include only hides it on that instance
+    devices[0]._tab.remove('a')
+    assert 'a' not in devices[0]._tab.get_filtered_dir_list()
+    assert 'a' in devices[1]._tab.get_filtered_dir_list()
+    assert 'c' not in devices[1]._tab.get_filtered_dir_list()
@@ -1,12 +1,19 @@
 import logging
 import threading
+import time
 from unittest.mock import Mock
 
+import numpy as np
+import pytest
+from ophyd.device import Component as Cpt
+from ophyd.device import Device
 from ophyd.signal import EpicsSignal, EpicsSignalRO, Signal
-from ophyd.sim import FakeEpicsSignal
+from ophyd.sim import FakeEpicsSignal, make_fake_device
 
 import pcdsdevices
-from pcdsdevices.signal import (AvgSignal, PytmcSignal,
+from pcdsdevices.signal import (AggregateSignal, AvgSignal, DecimatedAvgSignal,
+                                EwmaSignal, PercentileSignal, PytmcSignal,
+                                SampleBuffer, TimeAvgSignal,
                                 UnitConversionDerivedSignal)
 
 logger = logging.getLogger(__name__)
@@ -23,6 +30,146 @@ def test_pytmc_signal():
     assert isinstance(rosig, PytmcSignal)
 
 
+class SumSignal(AggregateSignal):
+    def __init__(self, *sigs, name, **kwargs):
+        super().__init__(name=name, **kwargs)
+        self._sub_signals.extend(sigs)
+
+    def _calc_readback(self):
+        return sum(self._cache[sig] for sig in self._sub_signals)
+
+
+def test_aggregate_signal_coalesce():
+    logger.debug('test_aggregate_signal_coalesce')
+    sigs = [Signal(name=f'sig{num}', value=0) for num in range(3)]
+    total = SumSignal(*sigs, name='total')
+    total.coalesce_delay = 0.1
+    done = threading.Event()
+    cb = Mock()
+
+    def callback(**kwargs):
+        cb(**kwargs)
+        done.set()
+
+    total.subscribe(callback, run=False)
+    for num, sig in enumerate(sigs):
+        sig.put(num + 1)
+    assert done.wait(timeout=2)
+    # One recalculation for the whole burst, no intermediate states
+    cb.assert_called_once()
+    assert cb.call_args[1]['old_value'] == 0
+    assert cb.call_args[1]['value'] == 6
+
+    # Default mode still recalculates for each update
+    total.coalesce_delay = None
+    sigs[0].put(0)
+    assert cb.call_count == 2
+    assert total.get() == 5
+
+
+class ParentSumSignal(SumSignal):
+    def __init__(self, *, name, parent, **kwargs):
+        super().__init__(parent.one, parent.two, name=name, parent=parent,
+                         **kwargs)
+
+
+class SumDevice(Device):
+    one = Cpt(Signal, value=0)
+    two = Cpt(Signal, value=0)
+    total = Cpt(ParentSumSignal, coalesce_delay=0.1)
+
+
+def test_aggregate_signal_coalesce_cpt():
+    logger.debug('test_aggregate_signal_coalesce_cpt')
+    dev = SumDevice(name='dev')
+    assert dev.total.coalesce_delay == 0.1
+    # Only this instance opts in
+    assert AggregateSignal.coalesce_delay is None
+    done = threading.Event()
+    cb = Mock()
+
+    def callback(**kwargs):
+        cb(**kwargs)
+        done.set()
+
+    dev.total.subscribe(callback, run=False)
+    dev.one.put(1)
+    dev.two.put(2)
+    assert done.wait(timeout=2)
+    cb.assert_called_once()
+    assert cb.call_args[1]['value'] == 3
+
+
+class CoalescedSumSignal(ParentSumSignal):
+    coalesce_delay = 0.1
+
+
+class UncoalescedSumDevice(SumDevice):
+    total = Cpt(CoalescedSumSignal, coalesce_delay=None)
+
+
+def test_aggregate_signal_coalesce_disable():
+    logger.debug('test_aggregate_signal_coalesce_disable')
+    dev = UncoalescedSumDevice(name='dev')
+    # An explicit None turns off the class default
+    assert dev.total.coalesce_delay is None
+    cb = Mock()
+    dev.total.subscribe(cb, run=False)
+    dev.one.put(1)
+    dev.two.put(2)
+    assert cb.call_count == 2
+
+
+class SlowGetSignal(Signal):
+    def get(self, **kwargs):
+        time.sleep(0.2)
+        return super().get(**kwargs)
+
+
+@pytest.mark.timeout(5)
+def test_aggregate_signal_parallel_get():
+    logger.debug('test_aggregate_signal_parallel_get')
+    sigs = [SlowGetSignal(name=f'sig{num}', value=num) for num in range(4)]
+    total = SumSignal(*sigs, name='total')
+    total.parallel_get = True
+    start = time.monotonic()
+    assert total.get() == 6
+    assert time.monotonic() - start < 0.6
+    assert total._cache == {sig: num for num, sig in enumerate(sigs)}
+
+
+@pytest.mark.timeout(5)
+def test_aggregate_signal_parallel_get_nested():
+    logger.debug('test_aggregate_signal_parallel_get_nested')
+    inner = []
+    for num in range(20):
+        sigs = [SlowGetSignal(name=f'sig{num}_{i}', value=1)
+                for i in range(2)]
+        inner.append(SumSignal(*sigs, name=f'inner{num}'))
+        inner[-1].parallel_get = True
+    # More nested gets than pool threads, these used to wait on each other
+    total = SumSignal(*inner, name='total')
+    total.parallel_get = True
+    assert total.get() == 40
+
+
+class SlowSumDevice(Device):
+    one = Cpt(SlowGetSignal, value=1)
+    two = Cpt(SlowGetSignal, value=2)
+    total = Cpt(ParentSumSignal, parallel_get=True)
+
+
+@pytest.mark.timeout(5)
+def test_aggregate_signal_parallel_get_cpt():
+    logger.debug('test_aggregate_signal_parallel_get_cpt')
+    dev = SlowSumDevice(name='dev')
+    assert dev.total.parallel_get
+    assert not AggregateSignal.parallel_get
+    start = time.monotonic()
+    assert dev.total.get() == 3
+    assert time.monotonic() - start < 0.35
+
+
 def test_avg_signal():
     logger.debug('test_avg_signal')
     sig = Signal(name='raw')
@@ -52,6 +199,96 @@ def test_avg_signal():
     assert cb.called
 
 
+def test_avg_signal_stats():
+    logger.debug('test_avg_signal_stats')
+    sig = Signal(name='raw')
+    avg = AvgSignal(sig, 5, name='avg')
+    assert avg.count == 0
+    assert np.isnan(avg.std)
+
+    rng = np.random.default_rng(0)
+    data = rng.normal(loc=1000, scale=3, size=23)
+    data[[4, 9, 10]] = np.nan
+    for num, value in enumerate(data):
+        sig.put(value)
+        window = data[max(0, num - 4):num + 1]
+        assert avg.count == np.count_nonzero(~np.isnan(window))
+        assert avg.get() == pytest.approx(np.nanmean(window))
+        assert avg.std == pytest.approx(np.nanstd(window))
+        assert avg.min == np.nanmin(window)
+        assert avg.max == np.nanmax(window)
+
+
+def test_stats_signals():
+    logger.debug('test_stats_signals')
+    sig = Signal(name='raw', value=np.nan)
+    time_avg = TimeAvgSignal(sig, 2, buffer_size=4, name='time_avg')
+    ewma = EwmaSignal(sig, 0.5, name='ewma')
+    decimated = DecimatedAvgSignal(sig, 3, name='decimated')
+    median = PercentileSignal(sig, 50, 5, name='median')
+    # All of them record into the same buffer, sized for the largest
+    assert time_avg.buffer is ewma.buffer is median.buffer
+    assert time_avg.buffer is SampleBuffer.for_signal(sig, 1)
+    assert time_avg.buffer.size == 5
+
+    values = [1, 3, 5, np.nan, 7, 9]
+    for num, value in enumerate(values):
+        sig.put(value, timestamp=num)
+    # Time window includes timestamps 3 to 5
+    assert time_avg.get() == 8
+    assert time_avg.count == 2
+    assert ewma.get() == 7.125
+    assert decimated.get() == 8
+    assert median.get() == 6
+
+    # Only the last 5 samples fit in the buffer, however long the window
+    sig = Signal(name='raw2', value=np.nan)
+    time_avg = TimeAvgSignal(sig, 100, buffer_size=5, name='time_avg')
+    for num in range(20):
+        sig.put(num, timestamp=10 + num)
+        assert time_avg.get() == np.mean(np.arange(max(0, num - 4), num + 1))
+
+    with pytest.raises(ValueError):
+        EwmaSignal(sig, name='bad')
+
+
+def test_time_avg_signal_resync():
+    logger.debug('test_time_avg_signal_resync')
+    sig = Signal(name='raw', value=np.nan)
+    time_avg = TimeAvgSignal(sig, 100, buffer_size=4, name='time_avg')
+    # The ones are lost to rounding in the running sum next to 1e16
+    sig.put(1e16, timestamp=0)
+    for num in range(1, 8):
+        sig.put(1, timestamp=num)
+    assert time_avg.get() == 1
+
+
+class StatsDevice(Device):
+    amplitude = Cpt(EpicsSignalRO, ':AMPL', kind='hinted')
+    amplitude_avg = Cpt(TimeAvgSignal, 'amplitude', window=100,
+                        kind='normal')
+    amplitude_ewma = Cpt(EwmaSignal, 'amplitude', alpha=0.5, kind='normal')
+    amplitude_decimated = Cpt(DecimatedAvgSignal, 'amplitude',
+                              decimation=2, kind='normal')
+    amplitude_median = Cpt(PercentileSignal, 'amplitude', percentile=50,
+                           samples=3, kind='normal')
+
+
+def test_stats_signal_components():
+    logger.debug('test_stats_signal_components')
+    FakeStatsDevice = make_fake_device(StatsDevice)
+    dev = FakeStatsDevice('TST:IPM', name='ipm')
+    for value in (2, 4, 6, 8):
+        dev.amplitude.sim_put(value)
+    assert dev.amplitude_avg.raw_sig is dev.amplitude
+    assert dev.amplitude_avg.buffer is dev.amplitude_median.buffer
+    reading = dev.read()
+    assert reading['ipm_amplitude_avg']['value'] == 5
+    assert reading['ipm_amplitude_ewma']['value'] == 6.25
+    assert reading['ipm_amplitude_decimated']['value'] == 7
+    assert reading['ipm_amplitude_median']['value'] == 6
+
+
 def test_unit_conversion_signal():
     orig = FakeEpicsSignal('sig', name='orig')
     orig.sim_put(5)
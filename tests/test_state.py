@@ -60,6 +60,22 @@ def test_state_positioner_basic():
     assert states.position == 'IN'
 
 
+def test_state_map():
+    logger.debug('test_state_map')
+    states = IntState('INT', name='int')
+    uno = states.states_enum.UNO
+    for value in ('UNO', 'IN', 'in', 2, '2', uno):
+        assert states.get_state(value) is uno
+    # The map is built once per enum and reused
+    assert states._get_state_map() is states._get_state_map()
+    assert states.position == 'IN'
+    assert states._position_names == {uno: 'IN'}
+    with pytest.raises(ValueError):
+        states.get_state('DOS')
+    with pytest.raises(ValueError):
+        states.get_state(1)
+
+
 def test_pvstate_positioner_logic():
     """
     Make sure all the internal logic works as expected. Use fake signals
@@ -95,6 +111,61 @@ def test_pvstate_positioner_logic():
         lim_obj.states_enum['defer']
 
 
+class FirstLimCls(LimCls):
+    _state_logic_mode = 'FIRST'
+
+
+def test_pvstate_decision_table():
+    logger.debug('test_pvstate_decision_table')
+    lim_obj = LimCls('BASE', name='test')
+    lim_obj2 = LimCls('BASE', name='test2')
+    first_obj = FirstLimCls('BASE', name='first')
+    lim_obj.state.get()
+    lim_obj2.state.get()
+    first_obj.state.get()
+    table = lim_obj.state._get_decision_table()
+    # Shared for equal logic, with all the listed combinations filled in
+    assert lim_obj2.state._get_decision_table() is table
+    assert first_obj.state._get_decision_table() is not table
+    assert table._table == {(0, 0): 'Unknown', (0, 1): 'in',
+                            (1, 0): 'out', (1, 1): 'Unknown'}
+    # FIRST mode stops at the first non-deferred state
+    first_obj.lowlim.put(0)
+    first_obj.highlim.put(0)
+    assert first_obj.position == 'IN'
+    # Values outside of the logic are looked up once and stored
+    lim_obj.lowlim.put(5)
+    assert lim_obj.position == 'Unknown'
+    assert table._lazy[(5, 0)] == 'Unknown'
+
+
+def test_pvstate_decision_table_changes():
+    logger.debug('test_pvstate_decision_table_changes')
+    lim_obj = LimCls('BASE', name='test')
+    other = LimCls('BASE', name='other')
+    # Per-instance logic, highlim at 0 means in here
+    other._state_logic = {'lowlim': {0: 'in', 1: 'defer'},
+                          'highlim': {0: 'in', 1: 'defer'}}
+    for obj in (lim_obj, other):
+        obj.lowlim.put(1)
+        obj.highlim.put(0)
+    assert lim_obj.position == 'OUT'
+    assert other.position == 'IN'
+    table = lim_obj.state._get_decision_table()
+    other_table = other.state._get_decision_table()
+    assert other_table is not table
+    # Each instance keeps its table instead of replacing the other one
+    assert lim_obj.state._get_decision_table() is table
+    assert other.state._get_decision_table() is other_table
+    # Changes made in place are picked up after state_logic_changed
+    other._state_logic['lowlim'][1] = 'out'
+    assert other.state._get_decision_table() is other_table
+    other.state_logic_changed()
+    assert other.state.get() == 'Unknown'
+    assert other.state._get_decision_table() is not other_table
+    assert lim_obj.state._get_decision_table() is table
+
+
 def test_pvstate_positioner_describe():
     logger.debug('test_pvstate_positioner_describe')
     lim_obj = LimCls('BASE', name='test')
@@ -205,3 +276,31 @@ def test_auto_states():
     enum_strs = ('Unknown', 'IN', 'OUT')
     states.state._run_subs(sub_type=states.state.SUB_META, enum_strs=enum_strs)
     assert states.states_list == list(enum_strs)
+
+
+def test_pvstate_decision_table_order():
+    logger.debug('test_pvstate_decision_table_order')
+    lim_obj = LimCls('BASE', name='test')
+    # Values are matched to the logic by signal name, not by position
+    lim_obj.state._sub_signals.reverse()
+    lim_obj.lowlim.put(0)
+    lim_obj.highlim.put(1)
+    assert lim_obj.position == 'IN'
+    lim_obj.lowlim.put(1)
+    lim_obj.highlim.put(0)
+    assert lim_obj.position == 'OUT'
+
+
+def test_pvstate_decision_table_eviction(monkeypatch):
+    logger.debug('test_pvstate_decision_table_eviction')
+    lim_obj = LimCls('BASE', name='test')
+    table = lim_obj.state._get_decision_table()
+    precomputed = dict(table._table)
+    monkeypatch.setattr(table, 'max_size', 2)
+    for value in range(5, 10):
+        table.lookup((value, 0))
+    table.lookup((6, 0))
+    table.lookup((10, 0))
+    # The least recently used lazy entry goes, precomputed ones stay
+    assert list(table._lazy) == [(6, 0), (10, 0)]
+    assert table._table == precomputed
@@ -1,10 +1,16 @@
+import os
+
 import pytest
 import numpy as np
 from ophyd.sim import make_fake_device
-from pcdsdevices.targets import (XYGridStage, convert_to_physical,
+from pcdsdevices.targets import (GridCorners, NpySampleStore, XYGridStage,
+                                 convert_to_physical,
                                  get_unit_meshgrid, mesh_interpolation,
-                                 snake_grid_list)
-from pcdsdevices.sim import FastMotor
+                                 snake_grid_array, snake_grid_list,
+                                 target_from_index, target_index)
+from pcdsdevices.sim import FastMotor, SlowMotor
+from bluesky import RunEngine
+from unittest.mock import Mock
 import yaml
 
 
@@ -166,8 +172,8 @@ def test_mapping_points(fake_grid_stage):
                          2.0, 2.0, 2.0, 2.0, 2.0,
                          3.0, 3.0, 3.0, 3.0, 3.0,
                          4.0, 4.0, 4.0, 4.0, 4.0]
-    assert expected_x_points == x
-    assert expected_y_points == y
+    assert expected_x_points == x.tolist()
+    assert expected_y_points == y.tolist()
 
     # test grid of 3 rows by 5 columns
     top_left, top_right, bottom_right, bottom_left = ((0, 0), (2, 0), (2, 4),
@@ -188,8 +194,8 @@ def test_mapping_points(fake_grid_stage):
                          2.0, 2.0, 2.0,
                          3.0, 3.0, 3.0,
                          4.0, 4.0, 4.0]
-    assert expected_x_points == x
-    assert expected_y_points == y
+    assert expected_x_points == x.tolist()
+    assert expected_y_points == y.tolist()
 
     # test 5 by 5 grid with slope of -0.25
     top_left, top_right, bottom_right, bottom_left = ((0, 0), (4, -1), (5, 3),
@@ -210,8 +216,8 @@ def test_mapping_points(fake_grid_stage):
                          2.0, 1.75, 1.50, 1.25, 1,
                          3.0, 2.75, 2.50, 2.25, 2,
                          4.0, 3.75, 3.50, 3.25, 3]
-    assert expected_x_points == x
-    assert expected_y_points == y
+    assert expected_x_points == x.tolist()
+    assert expected_y_points == y.tolist()
 
 
 def test_mapping_points_snake_like(fake_grid_stage):
@@ -233,8 +239,25 @@ def test_mapping_points_snake_like(fake_grid_stage):
                          2.0, 1.75, 1.50, 1.25, 1.0,
                          2.0, 2.25, 2.50, 2.75, 3.0,
                          4.0, 3.75, 3.50, 3.25, 3.0]
-    assert expected_x_points == x
-    assert expected_y_points == y
+    assert expected_x_points == x.tolist()
+    assert expected_y_points == y.tolist()
+
+
+def test_mapping_points_vectorized(fake_grid_stage):
+    corners = ((0.5, 0.1), (40.2, -1.3), (41.7, 30.9), (1.1, 29.5))
+    x, y = fake_grid_stage.map_points(True, *corners, m_rows=31, n_columns=17)
+    assert isinstance(x, np.ndarray) and x.shape == (31 * 17,)
+    # Same values as converting the points one at a time
+    a_coeffs, b_coeffs = mesh_interpolation(*corners)
+    xx, yy = get_unit_meshgrid(m_rows=31, n_columns=17)
+    expected = [convert_to_physical(a_coeffs, b_coeffs, i, j)
+                for i, j in zip(xx.ravel(), yy.ravel())]
+    expected_x = np.array([i for i, _ in expected]).reshape(31, 17)
+    expected_y = np.array([j for _, j in expected]).reshape(31, 17)
+    assert x.tolist() == snake_grid_list(expected_x)
+    assert y.tolist() == snake_grid_list(expected_y)
+    assert snake_grid_array([[1, 2], [3, 4], [5, 6]]).tolist() == [
+        1, 2, 4, 3, 5, 6]
 
 
 def test_compute_mapped_point(fake_grid_stage, sample_file):
@@ -260,8 +283,8 @@ def test_compute_mapped_point(fake_grid_stage, sample_file):
                          2.0, 2.0, 2.0, 2.0, 2.0,
                          3.0, 3.0, 3.0, 3.0, 3.0,
                          4.0, 4.0, 4.0, 4.0, 4.0]
-    assert res[0] == expected_x_points
-    assert res[1] == expected_y_points
+    assert res[0].tolist() == expected_x_points
+    assert res[1].tolist() == expected_y_points
     with pytest.raises(IndexError):
         fake_grid_stage.compute_mapped_point('test_sample', 0, 0)
     with pytest.raises(IndexError):
@@ -449,3 +472,254 @@ def test_reset_status(fake_grid_stage, sample_file):
         assert (yaml_dict['test_sample']['N'] ==
                 origin_info.get('N'))
         assert len(yaml_dict['test_sample']) == 10
+
+
+def test_npy_sample_store(fake_grid_stage, tmp_path):
+    stage = fake_grid_stage
+    store_dir = tmp_path / 'samples'
+    store_dir.mkdir()
+    assert isinstance(stage._get_store(store_dir), NpySampleStore)
+    assert stage.get_samples(path=store_dir) == []
+    corners = ((0, 0), (4, 0), (4, 4), (0, 4))
+    stage.map_points(True, *corners, m_rows=5, n_columns=5)
+    stage.save_grid('sample1', path=store_dir)
+    stage.save_grid('sample2', path=store_dir)
+    assert stage.get_samples(path=store_dir) == ['sample1', 'sample2']
+    assert stage.get_sample_map_info('sample1', path=store_dir) == (
+        5, 5, [0.0, 4.0, 0.0, 0.0, 0.0, 0.0, 4.0, 0.0])
+    data = stage.get_sample_data('sample1', path=store_dir)
+    assert [x['pos'] for x in data['xx']] == stage.positions_x.tolist()
+    assert not any(x['status'] for x in data['xx'])
+
+    store = stage._get_store(store_dir)
+    store.set_statuses('sample1', [0, 3])
+    # Statuses are on disk, kept across saves
+    fresh = NpySampleStore(str(store_dir))
+    assert fresh.get_statuses('sample1')[:5].tolist() == [
+        True, False, False, True, False]
+    stage.save_grid('sample1', path=store_dir)
+    assert NpySampleStore(str(store_dir)).get_statuses('sample1').sum() == 2
+    stage.reset_statuses('sample1', path=store_dir)
+    assert not store.get_statuses('sample1').any()
+    with pytest.raises(ValueError):
+        stage.reset_statuses('sample3', path=store_dir)
+
+
+def test_npy_sample_store_same_size_rewrite(tmp_path):
+    store = NpySampleStore(str(tmp_path))
+    store.save('sample1', {'M': 1}, [0], [0])
+    assert store.get_info('sample1') == {'M': 1}
+    # Another session rewrites the index to the same size within one tick
+    index_path = tmp_path / NpySampleStore.index_name
+    stat = index_path.stat()
+    index_path.write_text(index_path.read_text().replace('"M": 1', '"M": 2'))
+    os.utime(index_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert index_path.stat().st_size == stat.st_size
+    assert store.get_info('sample1') == {'M': 2}
+
+
+def test_target_index():
+    info = {'M': 3, 'N': 4}
+    # Snake-like by default, odd rows are reversed
+    assert target_index(info, 1, 1) == 0
+    assert target_index(info, 2, 1) == 7
+    assert target_index(info, 3, 2) == 9
+    assert target_index(info, [2, 2], [1, 4]).tolist() == [7, 4]
+    assert target_index(dict(info, snake_like=False), 2, 1) == 4
+    for index in range(12):
+        assert target_index(info, *target_from_index(info, index)) == index
+    with pytest.raises(IndexError):
+        target_index(info, 4, 1)
+    with pytest.raises(IndexError):
+        target_index(info, 1, 0)
+
+
+def test_shot_status(fake_grid_stage, tmp_path):
+    stage = fake_grid_stage
+    store_dir = tmp_path / 'samples'
+    store_dir.mkdir()
+    stage.map_points(True, (0, 0), (4, 0), (4, 4), (0, 4), m_rows=5,
+                     n_columns=5)
+    stage.save_grid('sample1', path=store_dir)
+    assert stage.count_remaining_targets('sample1', path=store_dir) == 25
+    assert stage.next_unshot_target('sample1', path=store_dir) == (1, 1)
+    stage.mark_shot('sample1', 1, [1, 2, 3, 4, 5], path=store_dir)
+    stage.mark_shot('sample1', 2, 5, path=store_dir)
+    assert stage.is_target_shot('sample1', 2, 5, path=store_dir)
+    assert not stage.is_target_shot('sample1', 2, 4, path=store_dir)
+    # Snake-like order continues on the second row from the right
+    assert stage.next_unshot_target('sample1', path=store_dir) == (2, 4)
+    assert stage.count_remaining_targets('sample1', path=store_dir) == 19
+    stage.mark_shot('sample1', 1, 1, shot=False, path=store_dir)
+    assert stage.next_unshot_target('sample1', path=store_dir) == (1, 1)
+
+
+def test_save_grid_mapped_shape(fake_grid_stage, tmp_path):
+    stage = fake_grid_stage
+    store_dir = tmp_path / 'samples'
+    store_dir.mkdir()
+    # Not the stage's default 5 x 5
+    stage.map_points(True, (0, 0), (3, 0), (3, 2), (0, 2), m_rows=3,
+                     n_columns=4)
+    stage.save_grid('sample1', path=store_dir)
+    assert stage.get_sample_map_info('sample1', path=store_dir)[:2] == (3, 4)
+    stage.mark_shot('sample1', 2, 1, path=store_dir)
+    statuses = stage._get_store(store_dir).get_statuses('sample1')
+    assert np.flatnonzero(statuses).tolist() == [7]
+    target = next(t for t in stage.iter_targets('sample1', skip_shot=False,
+                                                path=store_dir)
+                  if (t.m, t.n) == (2, 1))
+    assert (target.x, target.y) == pytest.approx((0, 1))
+
+    stage.positions_x = stage.positions_x[:-1]
+    with pytest.raises(ValueError):
+        stage.save_grid('sample2', path=store_dir)
+
+
+def test_save_grid_set_positions(fake_grid_stage, tmp_path):
+    stage = fake_grid_stage
+    store_dir = tmp_path / 'samples'
+    store_dir.mkdir()
+    stage.map_points(False, (0, 0), (3, 0), (3, 2), (0, 2), m_rows=3,
+                     n_columns=4)
+    # Positions set by hand replace the mapped shape and order
+    stage.m_n_points = 2, 3
+    stage.positions_x = [0, 1, 2, 2, 1, 0]
+    stage.positions_y = [0, 0, 0, 1, 1, 1]
+    stage.save_grid('sample1', path=store_dir)
+    assert stage.get_sample_map_info('sample1', path=store_dir)[:2] == (2, 3)
+    stage.mark_shot('sample1', 2, 1, path=store_dir)
+    statuses = stage._get_store(store_dir).get_statuses('sample1')
+    assert np.flatnonzero(statuses).tolist() == [5]
+
+
+def test_is_target_shot_yaml(fake_grid_stage, sample_file):
+    stage = fake_grid_stage
+    stage.m_n_points = 2, 4
+    stage.map_points(False, (0, 0), (3, 0), (3, 1), (0, 1))
+    stage.save_grid('sample1', path=sample_file)
+    assert not stage.is_target_shot('sample1', 2, 3)
+    stage.mark_shot('sample1', 2, 3)
+    assert stage.is_target_shot('sample1', 2, 3)
+    data = stage.get_sample_data('sample1')
+    assert [x['status'] for x in data['xx']] == [False] * 6 + [True, False]
+
+
+def test_iter_targets(fake_grid_stage, tmp_path):
+    stage = fake_grid_stage
+    store_dir = tmp_path / 'samples'
+    store_dir.mkdir()
+    stage.m_n_points = 2, 3
+    stage.map_points(True, (0, 0), (2, 0), (2, 1), (0, 1))
+    stage.save_grid('sample1', path=store_dir)
+    targets = list(stage.iter_targets('sample1', path=store_dir))
+    assert [(t.m, t.n) for t in targets] == [
+        (1, 1), (1, 2), (1, 3), (2, 3), (2, 2), (2, 1)]
+    assert [t.index for t in targets] == list(range(6))
+    assert [t.x for t in targets] == stage.positions_x.tolist()
+    assert targets[3].y == pytest.approx(1)
+    stage.mark_shot('sample1', 1, [1, 2], path=store_dir)
+    remaining = list(stage.iter_targets('sample1', path=store_dir))
+    assert [(t.m, t.n) for t in remaining] == [
+        (1, 3), (2, 3), (2, 2), (2, 1)]
+    assert len(list(stage.iter_targets('sample1', skip_shot=False,
+                                       path=store_dir))) == 6
+    with pytest.raises(ValueError):
+        next(stage.iter_targets('sample2', path=store_dir))
+
+
+def test_shoot_targets(fake_grid_stage, sample_file):
+    stage = fake_grid_stage
+    stage.m_n_points = 2, 2
+    stage.map_points(True, (0, 0), (1, 0), (1, 1), (0, 1))
+    stage.save_grid('sample1')
+    shots = []
+
+    def shoot(target):
+        shots.append((target.m, target.n, stage.x.position,
+                      stage.y.position))
+        if len(shots) == 3:
+            raise RuntimeError('Crash')
+
+    with pytest.raises(RuntimeError):
+        stage.shoot_targets('sample1', shoot=shoot)
+    assert shots == [(1, 1, 0, 0), (1, 2, 1, 0), (2, 2, 1, 1)]
+    assert stage.count_remaining_targets('sample1') == 2
+    # Resume with the target that was being shot
+    assert stage.shoot_targets('sample1', shoot=shots.append) == 2
+    assert (shots[-2].m, shots[-2].n) == (2, 2)
+    assert (shots[-1].m, shots[-1].n) == (2, 1)
+    assert stage.count_remaining_targets('sample1') == 0
+    assert stage.shoot_targets('sample1') == 0
+
+
+@pytest.mark.timeout(5)
+def test_shoot_targets_stop(tmp_path):
+    stage = XYGridStage(SlowMotor(name='slow_x'), SlowMotor(name='slow_y'),
+                        m_points=2, n_points=2, path=str(tmp_path))
+    stage.map_points(True, (0, 0), (10, 5), (10, 10), (0, 10))
+    stage.save_grid('sample1')
+    stage.mark_shot('sample1', 1, 1)
+    with pytest.raises(TimeoutError):
+        stage.shoot_targets('sample1', timeout=0.05)
+    # Both motors were told to stop, nothing was marked
+    assert stage.x._stop and stage.y._stop
+    assert stage.count_remaining_targets('sample1') == 3
+
+
+def test_target_plan(tmp_path):
+    stage = XYGridStage(FastMotor(name='grid_x'), FastMotor(name='grid_y'),
+                        m_points=2, n_points=2, path=str(tmp_path))
+    stage.map_points(True, (0, 0), (1, 0), (1, 1), (0, 1))
+    stage.save_grid('sample1')
+    stage.mark_shot('sample1', 1, 1)
+    docs = []
+    RE = RunEngine({})
+    RE(stage.target_plan('sample1', md={'scan_title': 'targets'}),
+       lambda name, doc: docs.append((name, doc)))
+    start = docs[0][1]
+    assert start['sample'] == 'sample1'
+    assert start['scan_title'] == 'targets'
+    events = [doc['data'] for name, doc in docs if name == 'event']
+    assert [(data['grid_x'], data['grid_y']) for data in events] == [
+        (1, 0), (1, 1), (0, 1)]
+    assert stage.count_remaining_targets('sample1') == 0
+
+
+def test_grid_corners(presets, tmp_path):
+    stage = XYGridStage(FastMotor(name='corner_x'), FastMotor(name='corner_y'),
+                        m_points=3, n_points=3, path=str(tmp_path))
+    assert stage.get_corners() is None
+    with pytest.raises(ValueError):
+        stage.map_points()
+    corners = ((0, 0), (2, 0), (2, 2), (0, 2))
+    for (x, y), name in zip(corners, ('top_left', 'top_right',
+                                      'bottom_right', 'bottom_left')):
+        stage.x.presets.add_hutch(value=x, name='x_' + name)
+        stage.y.presets.add_hutch(value=y, name='y_' + name)
+    stage._load_corners = Mock(wraps=stage._load_corners)
+    grid_corners = stage.get_corners()
+    assert isinstance(grid_corners, GridCorners)
+    assert stage.get_presets() == corners
+    a_coeffs, b_coeffs = mesh_interpolation(*corners)
+    assert grid_corners.a_coeffs.tolist() == a_coeffs.tolist()
+    assert grid_corners.b_coeffs.tolist() == b_coeffs.tolist()
+    xx, yy = stage.map_points(snake_like=False)
+    assert xx.tolist() == [0, 1, 2] * 3
+    assert stage.coefficients == grid_corners.coefficients
+    # Loaded once for all of the above
+    assert stage._load_corners.call_count == 1
+    assert stage.get_corners() is grid_corners
+
+    # Saving a corner again syncs the presets
+    generation = stage.x.presets.generation
+    stage.x.presets.add_hutch(value=4, name='x_top_right')
+    assert stage.x.presets.generation > generation
+    assert stage.get_presets()[1] == (4, 0)
+    assert stage._load_corners.call_count == 2
+    stage.y.presets.sync()
+    stage.get_corners()
+    assert stage._load_corners.call_count == 3
+    # Corners given as arguments take precedence
+    xx, yy = stage.map_points(False, top_right=(2, 0))
+    assert xx.tolist() == [0, 1, 2] * 3
@@ -1,9 +1,12 @@
 import logging
+import multiprocessing as mp
 import pty
 import sys
 import threading
 import time
 
+import numpy as np
+import pint
 import pytest
 
 import pcdsdevices.utils as util
@@ -62,6 +65,47 @@ def test_cbreak(sim_input):
     assert util.get_input() == '\n'
 
 
+@pytest.mark.timeout(1)
+def test_key_reader(sim_input):
+    logger.debug('test_key_reader')
+    with util.KeyReader() as reader:
+        assert reader.read(timeout=0.01) == []
+        sim_input.write(util.arrow_up + util.shift_arrow_left + 'a')
+        sim_input.flush()
+        assert reader.read() == [util.arrow_up, util.shift_arrow_left, 'a']
+
+
+@pytest.mark.timeout(5)
+def test_schedule_task_delay():
+    logger.debug('test_schedule_task_delay')
+    calls = []
+    done = threading.Event()
+
+    def task(num):
+        calls.append(num)
+        if num == 'last':
+            done.set()
+
+    threads_before = threading.active_count()
+    for num in range(10):
+        util.schedule_task(task, args=(num,), delay=0.1, key='merged')
+    util.schedule_task(task, args=('first',), delay=0.05)
+    util.schedule_task(task, args=('last',), delay=0.2)
+    assert threading.active_count() <= threads_before + 1
+    assert done.wait(timeout=2)
+    # Keyed tasks are merged into one call with the newest arguments
+    assert calls == ['first', 9, 'last']
+
+
+def test_get_thread_pool():
+    logger.debug('test_get_thread_pool')
+    pool = util.get_thread_pool('pcdsdevices_test', 2)
+    assert util.get_thread_pool('pcdsdevices_test', 4) is pool
+    assert not util.in_thread_pool('pcdsdevices_test')
+    assert pool.submit(util.in_thread_pool, 'pcdsdevices_test').result()
+    assert not pool.submit(util.in_thread_pool, 'other').result()
+
+
 def test_get_status_value():
     dummy_dictionary = {'dict1': {'dict2': {'value': 23}}}
     res = util.get_status_value(dummy_dictionary, 'dict1', 'dict2', 'value')
@@ -79,3 +123,70 @@ def test_get_status_float():
     res = util.get_status_float(dummy_dictionary, 'dict1', 'dict2', 'value',
                                 precision=3)
     assert res == '23.343'
+
+
+def test_convert_unit():
+    logger.debug('test_convert_unit')
+    ureg = pint.UnitRegistry()
+    for value, unit, new_unit in [(1, 's', 'ns'),
+                                  (-2.5, 'mm', 'inch'),
+                                  (3, 'mm/ns', 'm/s')]:
+        expected = (value * ureg.parse_expression(unit)).to(new_unit)
+        assert util.convert_unit(value, unit, new_unit) == pytest.approx(
+            expected.magnitude)
+    np.testing.assert_allclose(util.convert_unit([1, 2], 'mm', 'm'),
+                               [0.001, 0.002])
+    np.testing.assert_allclose(util.convert_unit(np.arange(3), 'ps', 's'),
+                               [0, 1e-12, 2e-12])
+    # Same types as pint, ints are kept when nothing changes
+    assert isinstance(util.convert_unit(5, 'mm', 'millimeter'), int)
+    assert util.convert_unit(np.arange(3), 'm', 'm').dtype == int
+    assert isinstance(util.convert_unit(5, 'm', 'km'), float)
+    # Offset units only work for numpy values in pint, so they go through it
+    assert util._conversion_factors('degC', 'K') is None
+    assert util.convert_unit(np.float64(5), 'degC', 'K') == pytest.approx(
+        278.15)
+    assert util.convert_unit(0, 'K', 'degC') == pytest.approx(-273.15)
+    # Repeated conversions are served from the cache
+    hits = util._conversion_factors.cache_info().hits
+    util.convert_unit(5, 's', 'ns')
+    assert util._conversion_factors.cache_info().hits == hits + 1
+
+
+@pytest.mark.timeout(30)
+def test_unit_registry_preload():
+    logger.debug('test_unit_registry_preload')
+    assert util.wait_for_unit_registry()
+    registry = util.get_unit_registry()
+    assert isinstance(registry, pint.UnitRegistry)
+    assert util.get_unit_registry() is registry
+    assert util.convert_unit(1, 'm', 'mm') == 1000
+
+
+def test_unit_registry_mode(caplog):
+    logger.debug('test_unit_registry_mode')
+    assert util._get_unit_registry_mode(None) == 'lazy'
+    assert util._get_unit_registry_mode('background') == 'background'
+    caplog.clear()
+    assert util._get_unit_registry_mode('eager') == 'lazy'
+    assert 'eager' in caplog.text
+
+
+def build_unit_registry():
+    util.get_unit_registry()
+
+
+@pytest.mark.timeout(60)
+@pytest.mark.skipif(not hasattr(util.os, 'register_at_fork'),
+                    reason='Requires os.register_at_fork')
+def test_unit_registry_fork(monkeypatch):
+    logger.debug('test_unit_registry_fork')
+    # Fork while the registry lock is held, as if it were being built
+    monkeypatch.setattr(util, 'ureg', None)
+    with util._ureg_lock:
+        proc = mp.get_context('fork').Process(target=build_unit_registry)
+        proc.start()
+    proc.join(timeout=30)
+    if proc.is_alive():
+        proc.kill()
+    assert proc.exitcode == 0